@@ -0,0 +1,64 @@
+import sys
+import argparse
+import tracemalloc
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.bids import BIDSFile  # noqa: E402
+
+
+def make_names(n_files):
+    """
+    This function generates the folder and name of the events files of a large data set, the folders being shared
+    strings as they are when returned by the walk.
+    :param n_files: (int) number of files
+    :return: (list of (string, string)) folder and name of each file
+    """
+    folders = {}
+    names = []
+    for i in range(n_files):
+        folder = "/data/bids/sub-{:04d}/ses-{}/beh".format(i // 1000, i % 2 + 1)
+        names.append((folders.setdefault(folder, sys.intern(folder)),
+                      "sub-{:04d}_ses-{}_task-prp_run-{}_events.tsv".format(i // 1000, i % 2 + 1, i % 500)))
+    return names
+
+
+def as_dicts(names):
+    """
+    This function builds the records walk_bids_root used to return: one dictionary per file, with the entities
+    taken from the position of each part of the name.
+    :param names: (list of (string, string)) see make_names
+    :return: (list of dicts)
+    """
+    files = []
+    for folder, fname in names:
+        parts = fname.split("_")
+        files.append({"file_path": folder, "fname": fname, "subject": parts[0], "session": parts[1],
+                      "task": parts[2], "run": parts[3]})
+    return files
+
+
+def as_bids_files(names):
+    return [BIDSFile.from_fname(folder, fname, datatype="beh") for folder, fname in names]
+
+
+def bytes_per_file(build, names):
+    tracemalloc.start()
+    files = build(names)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(files) == len(names)
+    return size / len(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory of the records of the events files")
+    parser.add_argument("--files", type=int, default=10 ** 6)
+    args = parser.parse_args()
+    names = make_names(args.files)
+    print("{} files".format(args.files))
+    print("dicts:      {:.0f} bytes per file".format(bytes_per_file(as_dicts, names)))
+    print("BIDSFile:   {:.0f} bytes per file".format(bytes_per_file(as_bids_files, names)))
+
+
+if __name__ == "__main__":
+    main()
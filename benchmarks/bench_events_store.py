@@ -0,0 +1,78 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.beh.events_store import consolidate_events, read_events_store  # noqa: E402
+from bids_converter.bids import walk_bids_root  # noqa: E402
+from bids_converter.example_var import tasks  # noqa: E402
+
+
+def make_bids_root(root, n_subjects, n_runs, n_trials, seed=0):
+    """
+    This function creates a synthetic bids root holding prp events files with some of the described columns.
+    :param root: (path) directory to create the bids root in
+    :param n_subjects: (int) number of subjects
+    :param n_runs: (int) number of runs per session, for two sessions
+    :param n_trials: (int) number of rows of each events file
+    :param seed: (int) seed of the random values
+    :return:
+    """
+    rng = np.random.default_rng(seed)
+    for subject in range(n_subjects):
+        for session in [1, 2]:
+            beh_dir = Path(root, "sub-{:03d}".format(subject), "ses-{}".format(session), "beh")
+            beh_dir.mkdir(parents=True)
+            for run in range(n_runs):
+                pd.DataFrame({
+                    "sub_id": "SX{:03d}".format(subject),
+                    "task": "prp",
+                    "is_practice": 0,
+                    "Trial": np.arange(n_trials),
+                    "category": rng.choice(["face", "object", "letter", "false"], n_trials),
+                    "SOA": rng.choice([0.0, 0.116, 0.232, 0.466], n_trials),
+                    "stim_jit": rng.exponential(1, n_trials).round(3),
+                }).to_csv(Path(beh_dir, "sub-{:03d}_ses-{}_task-prp_run-{}_events.tsv".format(subject, session, run)),
+                          sep="\t", index=False)
+
+
+def read_tsv_files(files):
+    return pd.concat([pd.read_csv(Path(f["file_path"], f["fname"]), sep="\t") for f in files], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the reading of all the events of a data set, tsv files "
+                                                 "against the consolidated parquet store")
+    parser.add_argument("--subjects", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--trials", type=int, default=100)
+    args = parser.parse_args()
+    root = tempfile.mkdtemp()
+    try:
+        make_bids_root(root, args.subjects, args.runs, args.trials)
+        files = walk_bids_root(root)
+        start = time.perf_counter()
+        consolidate_events(root, files, tasks.columns, verbose=False)
+        print("{} events files, consolidated in {:.3f}s".format(len(files), time.perf_counter() - start))
+        start = time.perf_counter()
+        consolidate_events(root, files, tasks.columns, verbose=False)
+        print("incremental rebuild, nothing changed: {:.3f}s".format(time.perf_counter() - start))
+        start = time.perf_counter()
+        events = read_tsv_files(files)
+        print("tsv files:     {:.3f}s, {} rows".format(time.perf_counter() - start, len(events)))
+        start = time.perf_counter()
+        events = read_events_store(root)
+        print("parquet store: {:.3f}s, {} rows".format(time.perf_counter() - start, len(events)))
+        start = time.perf_counter()
+        events = read_events_store(root, columns=["bids_subject", "SOA"])
+        print("parquet store, two columns: {:.3f}s".format(time.perf_counter() - start))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
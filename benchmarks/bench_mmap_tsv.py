@@ -0,0 +1,135 @@
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from pathlib import Path
+import numpy as np
+import pandas as pd
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.beh.validate_events import check_events_values  # noqa: E402
+from bids_converter.gzip_tsv import write_gzip  # noqa: E402
+from bids_converter.mmap_tsv import MappedTSV  # noqa: E402
+
+
+def make_events_file(events_file, n_rows, n_columns, seed=0):
+    """
+    This function writes a wide synthetic events file, alternating columns of levels and of numbers.
+    :param events_file: (path) file to write, gzipped if it ends with .gz
+    :param n_rows: (int) number of rows
+    :param n_columns: (int) number of columns
+    :param seed: (int) seed of the random values
+    :return:
+    """
+    rng = np.random.default_rng(seed)
+    events = pd.DataFrame({"c{}".format(i): rng.random(n_rows).round(4) if i % 2 else
+                           rng.choice(["left", "right", "n/a"], n_rows) for i in range(n_columns)})
+    content = events.to_csv(sep="\t", index=False).encode()
+    if str(events_file).endswith(".gz"):
+        write_gzip(events_file, content)
+    else:
+        Path(events_file).write_bytes(content)
+
+
+COLUMNS = ["c0", "c1", "c2"]
+CHECKS = {"c0": ("levels", {"left", "right"}), "c1": ("numeric", None), "c2": ("levels", {"left"})}
+
+
+def read_all(events_file):
+    pd.read_csv(events_file, sep="\t")
+
+
+def read_usecols(events_file):
+    pd.read_csv(events_file, sep="\t", usecols=COLUMNS, dtype=str, keep_default_na=False)
+
+
+def read_mapped(events_file):
+    with MappedTSV(events_file) as tsv:
+        tsv.read_columns(COLUMNS)
+
+
+def check_with_pandas(events_file):
+    # What the values validation used to do: read the checked columns, then compare them:
+    events = pd.read_csv(events_file, sep="\t", usecols=COLUMNS, dtype=str, keep_default_na=False)
+    for col, (check, levels) in CHECKS.items():
+        values = events[col][~events[col].isin(["", "n/a"])]
+        if check == "levels":
+            values[~values.isin(levels)].unique()
+        else:
+            pd.to_numeric(values, errors="coerce").isna().sum()
+
+
+def check_mapped(events_file):
+    check_events_values(events_file, CHECKS)
+
+
+CASES = {"read_csv, all columns": read_all, "read_csv, usecols": read_usecols,
+         "MappedTSV.read_columns": read_mapped, "checks with read_csv": check_with_pandas,
+         "check_events_values": check_mapped}
+
+
+def _anonymous_memory():
+    with open("/proc/self/status") as fl:
+        for line in fl:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) * 1024
+
+
+def _run_case(case, events_file, conn):
+    start_memory = peak_memory = _anonymous_memory()
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak_memory
+        while not done.wait(0.005):
+            peak_memory = max(peak_memory, _anonymous_memory())
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    CASES[case](events_file)
+    duration = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    conn.send((duration, max(peak_memory, _anonymous_memory()) - start_memory))
+
+
+def measure(case, events_file):
+    """
+    This function runs a case in a fresh process, so that the peak of its memory is not hidden by the memory already
+    held by the previous cases. The peak is that of the anonymous resident memory, sampled every 5 ms, so that the
+    pages of a mapped file, which the system can reclaim at any time, are not counted.
+    :param case: (string) key of CASES
+    :param events_file: (path) events file to read
+    :return: duration, peak: (float, float) in seconds and MB
+    """
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=_run_case, args=(case, events_file, child_conn))
+    process.start()
+    duration, peak = parent_conn.recv()
+    process.join()
+    return duration, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the reading and the checks of a few columns of a large "
+                                                 "events file, MappedTSV against pandas.read_csv")
+    parser.add_argument("--rows", type=int, default=10 ** 6)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--gzip", action="store_true", help="benchmark a gzipped events file (.tsv.gz)")
+    args = parser.parse_args()
+    root = tempfile.mkdtemp()
+    try:
+        events_file = Path(root, "events.tsv.gz" if args.gzip else "events.tsv")
+        make_events_file(events_file, args.rows, args.columns)
+        print("{} rows, {} columns, {:.0f} MB".format(args.rows, args.columns, events_file.stat().st_size / 2 ** 20))
+        for case in CASES:
+            print("{:<24} {:.2f}s, peak {:.0f} MB".format(case, *measure(case, events_file)))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
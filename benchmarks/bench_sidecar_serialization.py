@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.beh.convert_beh import _events_sidecar_content  # noqa: E402
+from bids_converter.example_var import tasks  # noqa: E402
+from bids_converter.task_metadata import resolve_tasks_metadata  # noqa: E402
+
+
+def dump_per_file(sidecar_files, task, task_description, events_col_description):
+    # What create_beh_events_sidecar used to do: build and serialize the sidecar again for each file:
+    for sidecar_file in sidecar_files:
+        json_sidecar = {"task": task_description[task], **events_col_description[task]}
+        with open(sidecar_file, 'w') as fl:
+            json.dump(json_sidecar, fl, indent=2)
+
+
+def write_cached(sidecar_files, task, task_description, events_col_description):
+    sidecars_content = {}
+    for sidecar_file in sidecar_files:
+        content = sidecars_content.get(task)
+        if content is None:
+            content = sidecars_content[task] = _events_sidecar_content(task, task_description,
+                                                                       events_col_description)
+        with open(sidecar_file, 'wb') as fl:
+            fl.write(content)
+
+
+def serialize_per_file(n_files, task, task_description, events_col_description):
+    for _ in range(n_files):
+        json.dumps({"task": task_description[task], **events_col_description[task]}, indent=2)
+
+
+def serialize_cached(n_files, task, task_description, events_col_description):
+    sidecars_content = {}
+    for _ in range(n_files):
+        if task not in sidecars_content:
+            sidecars_content[task] = _events_sidecar_content(task, task_description, events_col_description)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the serialization of the events sidecars, json.dump of each "
+                                                 "file against the bytes serialized once per task")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--task", default="prp")
+    args = parser.parse_args()
+    task_description, events_col_description = resolve_tasks_metadata(tasks)
+    # tmpfs where available, so that the timings of the writes measure the serialization rather than the disk:
+    root = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    try:
+        sidecar_files = [Path(root, "sub-{:05d}_task-{}_events.json".format(i, args.task)) for i in range(args.files)]
+        content = _events_sidecar_content(args.task, task_description, events_col_description)
+        dump_per_file(sidecar_files[:1], args.task, task_description, events_col_description)
+        assert sidecar_files[0].read_bytes() == content, "The cached bytes differ from json.dump!"
+        print("{} sidecars of task {}, {} bytes each".format(args.files, args.task, len(content)))
+        for label, function, target in [("serialize, json.dumps per file", serialize_per_file, args.files),
+                                        ("serialize, once per task", serialize_cached, args.files),
+                                        ("write, json.dump per file", dump_per_file, sidecar_files),
+                                        ("write, cached bytes", write_cached, sidecar_files)]:
+            start = time.perf_counter()
+            function(target, args.task, task_description, events_col_description)
+            duration = time.perf_counter() - start
+            print("{:<32} {:.3f}s, {:.0f} sidecars/s".format(label, duration, args.files / duration))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
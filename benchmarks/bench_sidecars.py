@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.beh.convert_beh import create_beh_events_sidecar  # noqa: E402
+from bids_converter.bids import walk_bids_root  # noqa: E402
+from bids_converter.example_var import tasks  # noqa: E402
+
+
+def make_bids_root(root, n_subjects, n_runs):
+    """
+    This function creates a synthetic bids root holding empty prp events files, as only their sidecars are written.
+    :param root: (path) directory to create the bids root in
+    :param n_subjects: (int) number of subjects
+    :param n_runs: (int) number of runs per subject
+    :return:
+    """
+    for subject in range(n_subjects):
+        beh_dir = Path(root, "sub-{:03d}".format(subject), "ses-1", "beh")
+        beh_dir.mkdir(parents=True)
+        for run in range(n_runs):
+            Path(beh_dir, "sub-{:03d}_ses-1_task-prp_run-{}_events.tsv".format(subject, run)).touch()
+
+
+def time_sidecars(files, n_jobs):
+    start = time.perf_counter()
+    create_beh_events_sidecar(files, tasks, verbose=False, overwrite=True, n_jobs=n_jobs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the writing of the events sidecars, serial against parallel")
+    parser.add_argument("--subjects", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--n-jobs", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="seconds added to each rename to stand in for the round trip of a network share")
+    args = parser.parse_args()
+    # tmpfs where available, so that the first timings measure the converter rather than the disk:
+    root = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    replace = os.replace
+
+    def slow_replace(src, dst):
+        time.sleep(args.latency)
+        replace(src, dst)
+    try:
+        make_bids_root(root, args.subjects, args.runs)
+        files = walk_bids_root(root)
+        print("{} sidecars".format(len(files)))
+        for label in ["tmpfs", "slowed"]:
+            if label == "slowed":
+                os.replace = slow_replace
+            for n_jobs in [1, args.n_jobs]:
+                duration = time_sidecars(files, n_jobs)
+                print("{:<7} n_jobs={:<3} {:.3f}s, {:.0f} sidecars/s".format(label, n_jobs, duration,
+                                                                         len(files) / duration))
+    finally:
+        os.replace = replace
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import shutil
+import pprint
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from bids_converter.example_var import tasks  # noqa: E402
+from bids_converter.task_metadata import TASK_METADATA_CACHE_DIR  # noqa: E402
+
+
+def run_python(code, *paths):
+    """
+    This function runs python code in a fresh interpreter with -X importtime, so that nothing is imported yet.
+    :param code: (string) code to run
+    :param paths: (paths) directories to add to the import path
+    :return: imports, output: (dict, string) cumulative import time of each module in microseconds, and the
+    standard output of the code
+    """
+    code = "import sys; sys.path[:0] = {!r}\n{}".format([str(path) for path in paths], code)
+    # The modules are compiled to .pyc files, as for a converter run from an installed package:
+    env = {key: val for key, val in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                            check=True, env=env)
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                imports[name.strip()] = int(cumulative)
+    return imports, result.stdout
+
+
+def write_dict_module(module_file):
+    """
+    This function writes the metadata of all the tasks as a module holding a dictionary literal, the way the
+    example task metadata used to be stored (logs_metadata_prp.py), as the baseline of the lazy loading.
+    :param module_file: (path) module to write
+    :return:
+    """
+    metadata = {task: tasks[task] for task in tasks}
+    Path(module_file).write_text("tasks_metadata = {}\n".format(pprint.pformat(metadata)))
+
+
+def time_task_loading(metadata_dir, task_list):
+    code = ("import time\nfrom bids_converter.task_metadata import TaskRegistry\nregistry = TaskRegistry({!r})\n"
+            "start = time.perf_counter()\nfor task in {!r}:\n    registry[task]\n"
+            "print(time.perf_counter() - start)").format(str(metadata_dir), task_list)
+    return float(run_python(code, ROOT)[1]) * 10 ** 6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup cost of the task metadata, lazy per-task "
+                                                 "files against a module holding all the tasks")
+    parser.add_argument("--task", default="prp", help="task of the data set to convert")
+    args = parser.parse_args()
+    root = tempfile.mkdtemp()
+    try:
+        metadata_dir = Path(root, "tasks")
+        shutil.copytree(Path(ROOT, "bids_converter", "example_var", "tasks"), metadata_dir,
+                        ignore=shutil.ignore_patterns(TASK_METADATA_CACHE_DIR))
+        write_dict_module(Path(root, "old_metadata.py"))
+        n_bytes = sum(len(json.dumps(tasks[task])) for task in tasks)
+        print("{} tasks, {} kB of metadata".format(len(tasks), n_bytes // 1000))
+
+        imports = run_python("import old_metadata", root)[0]
+        print("dictionary module, compiled:      {:>6} us".format(imports["old_metadata"]))
+        imports = run_python("import old_metadata", root)[0]
+        print("dictionary module, from .pyc:     {:>6} us".format(imports["old_metadata"]))
+        print("task {}, parsed:                 {:>6.0f} us".format(args.task,
+                                                                 time_task_loading(metadata_dir, [args.task])))
+        print("task {}, from the cache:         {:>6.0f} us".format(args.task,
+                                                                 time_task_loading(metadata_dir, [args.task])))
+        print("all tasks, from the cache:        {:>6.0f} us".format(time_task_loading(metadata_dir, list(tasks))))
+        imports = run_python("import bids_converter.example_var", ROOT)[0]
+        print("import bids_converter.example_var: {:>5} us (bids_converter: {} us, task_metadata: {} us)".format(
+            imports["bids_converter.example_var"], imports["bids_converter"], imports["bids_converter.task_metadata"]))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
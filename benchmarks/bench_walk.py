@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bids_converter.bids import walk_bids_root  # noqa: E402
+
+
+def make_bids_root(root, n_subjects, n_derivatives_dirs, n_derivatives_files):
+    """
+    This function creates a synthetic bids root: two sessions of two runs of beh events per subject, and a
+    derivatives/fs folder per subject holding as many files as a FreeSurfer output.
+    :param root: (path) directory to create the bids root in
+    :param n_subjects: (int) number of subjects
+    :param n_derivatives_dirs: (int) number of derivatives folders per subject
+    :param n_derivatives_files: (int) number of files per derivatives folder
+    :return:
+    """
+    for subject in range(n_subjects):
+        for session in [1, 2]:
+            beh_dir = Path(root, "sub-{:03d}".format(subject), "ses-{}".format(session), "beh")
+            beh_dir.mkdir(parents=True)
+            for run in [1, 2]:
+                Path(beh_dir, "sub-{:03d}_ses-{}_task-prp_run-{}_events.tsv".format(subject, session, run)).touch()
+        for folder in range(n_derivatives_dirs):
+            derivatives_dir = Path(root, "derivatives", "fs", "sub-{:03d}".format(subject), "d{}".format(folder))
+            derivatives_dir.mkdir(parents=True)
+            for file in range(n_derivatives_files):
+                Path(derivatives_dir, "f{}".format(file)).touch()
+
+
+def walk_everything(root):
+    """
+    This function is the traversal walk_bids_root used to do: every folder of the bids root is listed and the
+    events files are only filtered afterwards.
+    :param root: (path) bids root directory
+    :return: (list of strings) the events files
+    """
+    return [os.path.join(dirpath, f) for dirpath, _, filenames in os.walk(root) if "beh" in dirpath
+            for f in filenames if f.endswith("_events.tsv")]
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the scan of a bids root holding a large derivatives folder")
+    parser.add_argument("--subjects", type=int, default=50)
+    parser.add_argument("--derivatives-dirs", type=int, default=40)
+    parser.add_argument("--derivatives-files", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    root = tempfile.mkdtemp()
+    try:
+        make_bids_root(root, args.subjects, args.derivatives_dirs, args.derivatives_files)
+        n_files = len(walk_bids_root(root))
+        assert n_files == len(walk_everything(root))
+        print("{} events files, {} derivatives files".format(
+            n_files, args.subjects * args.derivatives_dirs * args.derivatives_files))
+        print("full walk then filter:         {:.4f}s".format(best_time(lambda: walk_everything(root), args.repeat)))
+        print("pruned walk:                   {:.4f}s".format(best_time(lambda: walk_bids_root(root), args.repeat)))
+        shutil.rmtree(Path(root, "derivatives"))
+        print("pruned walk, no derivatives:   {:.4f}s".format(best_time(lambda: walk_bids_root(root), args.repeat)))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
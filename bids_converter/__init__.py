@@ -1 +1,13 @@
-from .beh import *
\ No newline at end of file
+from .beh import *
+from .bids import (
+    BIDSFile, BIDSLayout, iter_bids_files, scan_bids_datatypes, walk_bids_root
+)
+from .gzip_tsv import (
+    read_gzip, write_gzip
+)
+from .mmap_tsv import (
+    MappedTSV
+)
+from .task_metadata import (
+    TaskRegistry, load_tasks_metadata
+)
@@ -1,3 +1,12 @@
 from .convert_beh import (
     beh_bids_metadata
-)
\ No newline at end of file
+)
+from .ingest_beh import (
+    ingest_beh_logs
+)
+from .events_schema import (
+    infer_events_schema
+)
+from .validate_events import (
+    validate_events_columns, validate_events_values
+)
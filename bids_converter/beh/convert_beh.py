@@ -1,64 +1,309 @@
 import os
 import json
+from functools import partial
 from pathlib import Path
-from ..bids import create_participants_tsv, create_participants_json, create_dataset_desc_json, create_readme, walk_bids_root   
+from ..bids import (create_participants_tsv, create_participants_json, create_dataset_desc_json, create_readme,
+                    iter_bids_files, imap_ordered, open_executor, write_file_atomic, write_if_changed, BIDSLayout)
+from ..task_metadata import resolve_tasks_metadata
+from .events_schema import infer_events_schema, merge_events_schema
+from .validate_events import (add_events_columns_check, check_events_columns, print_events_columns_report,
+                              validate_events_columns, validate_events_values)
 
-def create_beh_events_sidecar(beh_events_tsvs, task_description, events_col_description,
-                              verbose=True, overwrite=False):
+
+def _events_sidecar_content(task, task_description, events_col_description, serialized_columns=None):
+    """
+    This function builds the serialized json sidecar of the events files of a task. It is the same as json.dumps of
+    the sidecar with an indent of 2, but each column description is serialized only once per serialized_columns
+    cache: descriptions shared by several tasks (see resolve_columns) are reused as they are.
+    :param task: (string) task label, without the task- key
+    :param task_description: (dict) see create_beh_events_sidecar
+    :param events_col_description: (dict) see create_beh_events_sidecar
+    :param serialized_columns: (dict or None) cache of the serialized column descriptions, keyed by their id. The
+    descriptions must not change while the cache is in use
+    :return: (bytes) content of the sidecar
+    """
+    assert task in task_description, "The task-{} does not exist in the task_description dictionary!".format(task)
+    assert task in events_col_description, ("The task-{} does not exist in the events_col_description"
+                                            " dictionary!".format(task))
+    if serialized_columns is None:
+        serialized_columns = {}
+    # Combine the task description and the metadata for the column (a column called task replaces the description):
+    columns = events_col_description[task]
+    json_sidecar = [("task", columns.get("task", task_description[task]))]
+    json_sidecar += [(col, col_dict) for col, col_dict in columns.items() if col != "task"]
+    lines = []
+    for key, value in json_sidecar:
+        if id(value) not in serialized_columns:
+            # The object is kept along with its serialization, so that its id cannot be reused:
+            serialized_columns[id(value)] = (value, json.dumps(value, indent=2).replace("\n", "\n  "))
+        lines.append("  {}: {}".format(json.dumps(key), serialized_columns[id(value)][1]))
+    return ("{\n" + ",\n".join(lines) + "\n}").encode()
+
+
+def _save_sidecar(sidecar_file, content, verbose=True, overwrite=False, incremental=False):
+    """
+    This function saves a sidecar file according to the overwrite and incremental options, see
+    create_beh_events_sidecar.
+    :param sidecar_file: (path) file to save
+    :param content: (bytes) content of the file
+    :param verbose: (boolean)
+    :param overwrite: (boolean)
+    :param incremental: (boolean)
+    :return: (string) "written", "unchanged" or "skipped"
+    """
+    if incremental:
+        if not write_if_changed(sidecar_file, content):
+            return "unchanged"
+    elif os.path.isfile(sidecar_file) and not overwrite:
+        if verbose:
+            print("=" * 40)
+            print("WARNING: The file {} already exists. If you want to overwrite it, set overwrite to true!"
+                  .format(sidecar_file))
+        return "skipped"
+    else:
+        write_file_atomic(sidecar_file, content)
+    if verbose:
+        print("=" * 40)
+        print("Saving {}".format(sidecar_file))
+    return "written"
+
+
+def _save_sidecars(sidecars, n_jobs=1, executor=None, verbose=True, overwrite=False, incremental=False):
+    """
+    This function saves sidecar files, either one after the other or with a pool of workers. On network drives,
+    each write is a round trip to the server, so that several threads speed up the writing a lot. The number of
+    writes waiting in the pool is bounded, so that sidecars streamed from a scan are not all held in memory.
+    :param sidecars: (iterable of (path, bytes)) files to save and their content
+    :param n_jobs: (int) number of workers writing the files
+    :param executor: (string, Executor or None) see open_executor
+    :param verbose: (boolean)
+    :param overwrite: (boolean)
+    :param incremental: (boolean) see create_beh_events_sidecar
+    :return: (dict) number of files written, unchanged and skipped
+    """
+    counts = {"written": 0, "unchanged": 0, "skipped": 0}
+    save = partial(_save_sidecar, verbose=verbose, overwrite=overwrite, incremental=incremental)
+    with open_executor(executor, n_jobs=n_jobs) as pool:
+        for status in imap_ordered(pool, save, sidecars, max_pending=4 * n_jobs):
+            counts[status] += 1
+    return counts
+
+
+def create_beh_events_sidecar(beh_events_tsvs, task_description, events_col_description=None,
+                              verbose=True, overwrite=False, incremental=False, n_jobs=1, executor=None,
+                              events_schema=None):
     """
     This function creates side car files for the behavioral events tsv files according to the BIDS conventions.
-    :param beh_events_tsvs: (list of path) List of all events files found within the bids directory
-    :param task_description: (dict) contains the description of each task found within this data set
+    :param beh_events_tsvs: (BIDSLayout or list of BIDSFile) events files found within the bids directory. Any
+    iterable works, such as the generator returned by iter_bids_files
+    :param task_description: (dict) contains the description of each task found within this data set. Alternatively,
+    a TaskRegistry or the directory of the task metadata files, holding both the task and the columns descriptions
+    (see TaskRegistry), in which case events_col_description is not passed
     :param events_col_description: (dict) contains the metadata for each column in the log files associated with each
     task in this data set
     :param verbose: (boolean)
     :param overwrite:
+    :param incremental: (boolean) whether to only write the sidecars whose content changed. Existing sidecars are
+    compared to the new content and left untouched if identical, whatever the value of overwrite
+    :param n_jobs: (int) number of threads writing the sidecars. Each sidecar is written to a temporary file that is
+    then moved in place, so that an interrupted run never leaves a truncated sidecar behind
+    :param executor: (string, Executor or None) "serial", "threads" or "processes", see open_executor
+    :param events_schema: (dict or None) description of the columns inferred from the data, see
+    infer_events_schema. It is merged under events_col_description, which takes precedence
+    :return: beh_events_tsvs: the list
+    """
+    task_description, events_col_description = resolve_tasks_metadata(task_description, events_col_description)
+    if events_schema is not None:
+        events_col_description = merge_events_schema(events_col_description, events_schema)
+    # The sidecar only depends on the task: serialize it once per task. The cache lives for a single call, so that
+    # changes to the description dictionaries between calls are always picked up:
+    sidecars_content = {}
+    serialized_columns = {}
+
+    def sidecars():
+        for f in beh_events_tsvs:
+            # Get the task of the current file
+            task = f["task"].split('-')[1]
+            content = sidecars_content.get(task)
+            if content is None:
+                content = sidecars_content[task] = _events_sidecar_content(task, task_description,
+                                                                           events_col_description,
+                                                                           serialized_columns)
+            # Create the json sidecar file:
+            yield Path(f["file_path"], f["fname"].split('.')[0] + ".json"), content
+    counts = _save_sidecars(sidecars(), n_jobs=n_jobs, executor=executor, verbose=verbose, overwrite=overwrite,
+                            incremental=incremental)
+    if verbose:
+        print("=" * 40)
+        print("Events sidecars: {written} written, {unchanged} unchanged, {skipped} skipped".format(**counts))
+
+    return beh_events_tsvs
+
+
+def create_beh_inherited_sidecars(bids_root, beh_events_tsvs, task_description, events_col_description=None,
+                                  level="root", verbose=True, overwrite=False, incremental=False, n_jobs=1,
+                                  executor=None, events_schema=None):
+    """
+    This function creates the events sidecars following the BIDS inheritance principle: instead of one identical
+    sidecar next to each events file, a single sidecar is written per task, either at the root of the bids directory
+    (task-<label>_events.json) or in each session folder (sub-<label>[_ses-<label>]_task-<label>_events.json). It
+    applies to every events file of that task below it. Sidecars already sitting next to an events file take
+    precedence over the inherited one: those that differ from it are reported as overrides and left untouched, those
+    that are identical are reported as redundant.
+    :param bids_root: (path) bids root directory
+    :param beh_events_tsvs: (BIDSLayout or iterable of BIDSFile) events files found within the bids directory
+    :param task_description: (dict) see create_beh_events_sidecar
+    :param events_col_description: (dict) see create_beh_events_sidecar
+    :param level: (string) "root" or "session", where to write the inherited sidecars
+    :param verbose: (boolean)
+    :param overwrite: (boolean)
+    :param incremental: (boolean) see create_beh_events_sidecar
+    :param n_jobs: (int) see create_beh_events_sidecar
+    :param executor: (string, Executor or None) see create_beh_events_sidecar
+    :param events_schema: (dict or None) see create_beh_events_sidecar
     :return: beh_events_tsvs: the list
     """
-    # Loop through each file to save the corresponding json sidecar:
+    task_description, events_col_description = resolve_tasks_metadata(task_description, events_col_description)
+    if events_schema is not None:
+        events_col_description = merge_events_schema(events_col_description, events_schema)
+    assert level in ["root", "session"], "The inheritance level must be either root or session, not {}!".format(level)
+    sidecars_content = {}
+    serialized_columns = {}
+    inherited_files = {}
+    n_overrides, n_redundant = 0, 0
     for f in beh_events_tsvs:
-        # Get the task of the current file
         task = f["task"].split('-')[1]
-        assert task in list(task_description.keys()), "The task-{} does not exist in the task_description dictionary!"
-        assert task in list(events_col_description.keys()), ("The task-{} does not exist in the events_col_description"
-                                                             " dictionary!")
-        # Combine the task description and the metadata for the column:
-        json_sidecar = {"task": task_description[task], **events_col_description[task]}
-        # Create the json sidecar file:
-        sidecar_file = Path(f["file_path"], f["fname"].split('.')[0] + ".json")
-        if os.path.isfile(sidecar_file) and not overwrite:
-            if verbose:
-                print("=" * 40)
-                print("WARNING: The file {} already exists. If you want to overwrite it, set overwrite to true!"
-                      .format(sidecar_file))
+        content = sidecars_content.get(task)
+        if content is None:
+            content = sidecars_content[task] = _events_sidecar_content(task, task_description,
+                                                                       events_col_description, serialized_columns)
+        # Where the inherited sidecar of this file goes:
+        if level == "root":
+            inherited_file = Path(bids_root, "{}_events.json".format(f["task"]))
         else:
-            if verbose:
-                print("=" * 40)
-                print("Saving {}".format(sidecar_file))
-            with open(sidecar_file, 'w') as fl:
-                json.dump(json_sidecar, fl, indent=2)
+            entities = [ent for ent in [f["subject"], f["session"], f["task"]] if ent is not None]
+            inherited_file = Path(Path(f["file_path"]).parent, "_".join(entities) + "_events.json")
+        inherited_files[inherited_file] = content
+        # Check whether a sidecar next to the events file overrides the inherited one:
+        sidecar_file = Path(f["file_path"], f["fname"].split('.')[0] + ".json")
+        if os.path.isfile(sidecar_file):
+            with open(sidecar_file, 'rb') as fl:
+                if fl.read() == content:
+                    n_redundant += 1
+                else:
+                    n_overrides += 1
+                    if verbose:
+                        print("=" * 40)
+                        print("WARNING: {} overrides the inherited sidecar".format(sidecar_file))
+    counts = _save_sidecars(inherited_files.items(), n_jobs=n_jobs, executor=executor, verbose=verbose,
+                            overwrite=overwrite, incremental=incremental)
+    if verbose:
+        print("=" * 40)
+        print("Inherited events sidecars: {written} written, {unchanged} unchanged, {skipped} skipped".format(
+            **counts))
+        print("{} per-file sidecars override the inherited ones, {} are identical to them and can be deleted".format(
+            n_overrides, n_redundant))
 
     return beh_events_tsvs
 
-def beh_bids_metadata(bids_root, task_descriptions, logs_descriptions, verbose=True, overwrite=False):
+
+def beh_bids_metadata(bids_root, task_descriptions, logs_descriptions=None, verbose=True, overwrite=False,
+                      use_index=False, n_jobs=1, streaming=False, incremental=False, inheritance=None,
+                      infer_schema=False, validate=False, validate_values=False, executor=None,
+                      demographics=None, consolidate=False):
     """
 
     :param bids_root:
-    :param task_descriptions:
-    :param logs_descriptions:
+    :param task_descriptions: (dict, TaskRegistry or path) the task descriptions, or the task metadata registry
+    holding both the task and the columns descriptions, see create_beh_events_sidecar
+    :param logs_descriptions: (dict or None) the columns descriptions, None if task_descriptions is a registry
     :param verbose:
     :param overwrite:
+    :param use_index: (boolean) keep a persistent index of the bids root to speed up subsequent scans, see
+    walk_bids_root
+    :param n_jobs: (int) number of threads used to scan the bids root and number of workers of the per-file steps,
+    see walk_bids_root and executor
+    :param streaming: (boolean) whether to create the sidecars while the bids root is being scanned instead of
+    listing all the files first. Only one file per subject is kept in memory for the participants files
+    :param incremental: (boolean) only write the events sidecars whose content changed, see
+    create_beh_events_sidecar
+    :param inheritance: (string or None) if "root" or "session", write one events sidecar per task at that level
+    following the BIDS inheritance principle instead of one per events file, see create_beh_inherited_sidecars
+    :param infer_schema: (boolean) whether to complete the description of the columns with the levels and ranges
+    found in the events files, see infer_events_schema. The events files must all be read before writing the
+    sidecars, so that this cannot be combined with streaming
+    :param validate: (boolean) whether to check that the columns of each events file match the described columns,
+    reading only the header of each file, see validate_events_columns
+    :param validate_values: (boolean) whether to check that the values of each events file match the declared
+    levels and units, reading every file in full, see validate_events_values. This cannot be
+    combined with streaming
+    :param executor: (string or None) how the per-file steps (sidecars, validation, schema inference) are mapped
+    over the files: "serial", "threads" or "processes" with n_jobs workers. If None, it is read from the
+    BIDS_CONVERTER_EXECUTOR environment variable, else each step picks threads or processes depending on whether it
+    is I/O or CPU bound. The results are gathered in the order of the files, so that the output does not depend on
+    the executor
+    :param demographics: (path, pandas data frame or None) table with the age, sex... of each participant, merged
+    into the participants tsv, see create_participants_tsv
+    :param consolidate: (boolean) whether to consolidate all the events files into a parquet store under
+    derivatives/events_store, see consolidate_events. This requires pyarrow and cannot be combined with streaming
     :return:
     """
-    # 1. List all the events files in the directory:
-    evts_files = walk_bids_root(bids_root)
+    assert not (infer_schema and streaming), "The schema inference cannot be combined with streaming!"
+    assert not (validate_values and streaming), "The values validation cannot be combined with streaming!"
+    assert not (consolidate and streaming), "The events consolidation cannot be combined with streaming!"
+    task_descriptions, logs_descriptions = resolve_tasks_metadata(task_descriptions, logs_descriptions)
+
+    def create_sidecars(evts_files, events_schema=None):
+        if inheritance is None:
+            create_beh_events_sidecar(evts_files, task_descriptions, logs_descriptions,
+                                      verbose=verbose, overwrite=overwrite, incremental=incremental, n_jobs=n_jobs,
+                                      executor=executor, events_schema=events_schema)
+        else:
+            create_beh_inherited_sidecars(bids_root, evts_files, task_descriptions, logs_descriptions,
+                                          level=inheritance, verbose=verbose, overwrite=overwrite,
+                                          incremental=incremental, n_jobs=n_jobs, executor=executor,
+                                          events_schema=events_schema)
+
+    if streaming:
+        # 1. and 2. Create each events sidecar as soon as the events file is found:
+        subjects_files = {}
+        columns_report = {}
+
+        def accumulate(files):
+            for f in files:
+                subjects_files.setdefault(f["subject"], f)
+                if validate:
+                    add_events_columns_check(columns_report, f, *check_events_columns(f, logs_descriptions))
+                yield f
+        create_sidecars(accumulate(iter_bids_files(bids_root, use_index=use_index, n_jobs=n_jobs)))
+        evts_files = BIDSLayout(subjects_files.values())
+        if validate and verbose:
+            print_events_columns_report(columns_report)
+    else:
+        # 1. List all the events files in the directory and index them:
+        evts_files = BIDSLayout.from_bids_root(bids_root, use_index=use_index, n_jobs=n_jobs)
+        if validate:
+            validate_events_columns(evts_files, logs_descriptions, n_jobs=n_jobs, executor=executor,
+                                    verbose=verbose)
+        if validate_values:
+            validate_events_values(evts_files, logs_descriptions, n_jobs=n_jobs, executor=executor,
+                                   verbose=verbose)
+
+        # 2. For each events file, create the events sidecar, describing each column:
+        events_schema = None
+        if infer_schema:
+            events_schema = infer_events_schema(evts_files, n_jobs=n_jobs, executor=executor, verbose=verbose)
+        create_sidecars(evts_files, events_schema=events_schema)
 
-    # 2. For each events file, create the events sidecar, describing each column:
-    create_beh_events_sidecar(evts_files, task_descriptions, logs_descriptions,
-                              verbose=verbose, overwrite=overwrite)
+        if consolidate:
+            # pyarrow is only needed for the consolidation:
+            from .events_store import consolidate_events
+            consolidate_events(bids_root, evts_files, logs_descriptions, n_jobs=n_jobs, executor=executor,
+                               verbose=verbose, overwrite=overwrite)
 
     # 3. Create the participants tsv:
-    participants_tsv = create_participants_tsv(bids_root, evts_files, verbose=verbose, overwrite=overwrite)
+    participants_tsv = create_participants_tsv(bids_root, evts_files, demographics=demographics, verbose=verbose,
+                                               overwrite=overwrite)
 
     # 4. Create the participants json file:
     create_participants_json(bids_root, participants_tsv, verbose=verbose, overwrite=overwrite)
@@ -74,10 +319,7 @@ def beh_bids_metadata(bids_root, task_descriptions, logs_descriptions, verbose=T
 
 
 if __name__ == "__main__":
-    from ..example_var import task_desc_prp, logs_metadata_prp, ev
-    # Load the text information from files:
-    task_desc = task_desc_prp.tasks_descriptions
-    log_desc = logs_metadata_prp.logs_column_descriptions
-    # Create the bids metadata:
-    beh_bids_metadata(ev.bids_root, task_desc, log_desc, verbose=True, overwrite=False)
+    from ..example_var import tasks, ev
+    # The text information is loaded from the task files, only for the tasks found in the bids directory:
+    beh_bids_metadata(ev.bids_root, tasks, verbose=True, overwrite=False)
 
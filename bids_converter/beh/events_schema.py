@@ -0,0 +1,159 @@
+from pathlib import Path
+from collections.abc import Mapping
+import pandas as pd
+from ..bids import imap_ordered, open_executor
+
+
+def _column_stats(values, max_levels):
+    """
+    This function computes the statistics of a column of one events file with vectorized operations. The levels are
+    the values as written in the file, so that an integer column with missing values gives the levels 1 and 2 rather
+    than 1.0 and 2.0, and only the minimum and maximum are computed from the parsed numbers.
+    :param values: (pandas series of strings) values of the column, missing values dropped
+    :param max_levels: (int) maximal number of distinct values for the column to be considered categorical
+    :return: stats: (dict) whether the column is numeric, its minimum and maximum and its distinct values (None if
+    there are more than max_levels of them)
+    """
+    numbers = pd.to_numeric(values, errors="coerce")
+    numeric = not numbers.isna().any()
+    stats = {"numeric": numeric, "minimum": None, "maximum": None, "levels": None}
+    if numeric and len(values) > 0:
+        stats["minimum"], stats["maximum"] = numbers.min().item(), numbers.max().item()
+    if values.nunique() <= max_levels:
+        stats["levels"] = set(values.unique().tolist())
+    return stats
+
+
+def _merge_column_stats(stats, other, max_levels):
+    """
+    This function merges the statistics of a column across two sets of events files. The merge does not depend on
+    the order of the files.
+    :param stats: (dict or None) statistics so far, None for the first file
+    :param other: (dict) statistics of the column in more files
+    :param max_levels: (int) see _column_stats
+    :return: stats: (dict) the merged statistics
+    """
+    if stats is None:
+        return other
+    merged = {"numeric": stats["numeric"] and other["numeric"], "minimum": None, "maximum": None, "levels": None}
+    minimums = [val for val in [stats["minimum"], other["minimum"]] if val is not None]
+    maximums = [val for val in [stats["maximum"], other["maximum"]] if val is not None]
+    if merged["numeric"] and minimums:
+        merged["minimum"], merged["maximum"] = min(minimums), max(maximums)
+    if stats["levels"] is not None and other["levels"] is not None:
+        levels = stats["levels"] | other["levels"]
+        merged["levels"] = levels if len(levels) <= max_levels else None
+    return merged
+
+
+def _file_columns_stats(events_file, max_levels, verbose=True):
+    """
+    This function computes the statistics of each column of one events file.
+    :param events_file: (path) events file
+    :param max_levels: (int) see _column_stats
+    :param verbose: (boolean)
+    :return: (dict) column name -> statistics
+    """
+    if verbose:
+        print("=" * 40)
+        print("Inferring the columns of {}".format(events_file))
+    events = pd.read_csv(events_file, sep="\t", dtype=str, na_values=["n/a", ""], keep_default_na=False)
+    return {col: _column_stats(events[col].dropna(), max_levels) for col in events.columns}
+
+
+def infer_events_schema(beh_events_tsvs, max_levels=20, n_jobs=1, executor=None, verbose=True):
+    """
+    This function infers the description of the columns of the events files of each task from the data itself. The
+    statistics of each column are computed for each file separately (map), possibly in parallel, and then merged
+    across files (reduce). Only the statistics are kept across files, so that the memory footprint does not depend
+    on the number of files. For each column, the distinct values are listed as Levels if there are no more than
+    max_levels of them, and the minimum and maximum are reported for numeric columns.
+    :param beh_events_tsvs: (BIDSLayout or iterable of BIDSFile) events files found within the bids directory
+    :param max_levels: (int) maximal number of distinct values for a column to be described with Levels
+    :param n_jobs: (int) number of workers reading the files
+    :param executor: (string, Executor or None) see open_executor. Defaults to processes when n_jobs > 1
+    :param verbose: (boolean)
+    :return: events_schema: (dict) for each task (without the task- key), the inferred description of each column
+    """
+    tasks = []
+
+    def args_list():
+        for f in beh_events_tsvs:
+            tasks.append(f["task"].split('-')[1])
+            yield Path(f["file_path"], f["fname"]), max_levels, verbose
+
+    columns_stats = {}
+    with open_executor(executor, n_jobs=n_jobs, default="processes") as pool:
+        for file_stats in imap_ordered(pool, _file_columns_stats, args_list(), max_pending=2 * n_jobs):
+            task_stats = columns_stats.setdefault(tasks.pop(0), {})
+            for col, stats in file_stats.items():
+                task_stats[col] = _merge_column_stats(task_stats.get(col), stats, max_levels)
+
+    events_schema = {}
+    for task, task_stats in columns_stats.items():
+        events_schema[task] = {}
+        for col, stats in task_stats.items():
+            col_dict = {"Description": ""}
+            if stats["levels"] is not None:
+                col_dict["Levels"] = {str(level): "" for level in sorted(stats["levels"], key=str)}
+            if stats["numeric"] and stats["minimum"] is not None:
+                col_dict["Minimum"] = stats["minimum"]
+                col_dict["Maximum"] = stats["maximum"]
+            events_schema[task][col] = col_dict
+    return events_schema
+
+
+class MergedEventsSchema(Mapping):
+    """
+    This class maps each task to the inferred description of its columns merged under the hand-written one, see
+    merge_events_schema. The tasks are merged when first accessed, so that the hand-written descriptions of the tasks
+    that are not in the data, e.g. those of a TaskRegistry, are never loaded.
+    """
+
+    def __init__(self, events_col_description, events_schema):
+        """
+        :param events_col_description: (dict) hand-written description of each column of each task
+        :param events_schema: (dict) inferred description of each column of each task, see infer_events_schema
+        """
+        self.events_col_description = events_col_description
+        self.events_schema = events_schema
+        self._merged = {}
+
+    def __getitem__(self, task):
+        if task not in self._merged:
+            if task not in self:
+                raise KeyError(task)
+            described = self.events_col_description[task] if task in self.events_col_description else {}
+            inferred = self.events_schema.get(task, {})
+            merged = {}
+            for col, col_dict in described.items():
+                merged[col] = dict(col_dict)
+                merged[col].update({key: val for key, val in inferred.get(col, {}).items() if key not in col_dict})
+            merged.update({col: col_dict for col, col_dict in inferred.items() if col not in described})
+            self._merged[task] = merged
+        return self._merged[task]
+
+    def __contains__(self, task):
+        return task in self.events_schema or task in self.events_col_description
+
+    def __iter__(self):
+        yield from self.events_col_description
+        yield from (task for task in self.events_schema if task not in self.events_col_description)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "MergedEventsSchema({!r}, {!r})".format(self.events_col_description, self.events_schema)
+
+
+def merge_events_schema(events_col_description, events_schema):
+    """
+    This function merges the inferred description of the columns under the hand-written one: the hand-written
+    fields take precedence, the inferred ones only fill the gaps. Columns that are only found in the data are
+    added after the hand-written ones and should be documented.
+    :param events_col_description: (dict) hand-written description of each column of each task
+    :param events_schema: (dict) inferred description of each column of each task, see infer_events_schema
+    :return: (MergedEventsSchema) merged description of each column of each task, merged lazily per task
+    """
+    return MergedEventsSchema(events_col_description, events_schema)
@@ -0,0 +1,200 @@
+import os
+import json
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from ..bids import imap_ordered, open_executor, write_if_changed, BIDSLayout
+
+# Name of the derivatives folder holding the consolidated events:
+EVENTS_STORE_NAME = "events_store"
+# Columns holding the entities of each row, prefixed so that they do not collide with the columns of the logs:
+TASK_COLUMN, SUBJECT_COLUMN, SESSION_COLUMN, RUN_COLUMN = "bids_task", "bids_subject", "bids_session", "bids_run"
+# Key of the parquet metadata listing the events files a partition was built from:
+SOURCES_METADATA_KEY = b"bids_sources"
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def events_column_types(task_columns):
+    """
+    This function derives the type of each column of the events files of a task from its description: columns with
+    Units, or whose Levels are all numbers, are stored as floats, all other columns are stored as strings.
+    :param task_columns: (dict) description of each column of a task
+    :return: (dict) column name -> "float64" or "string"
+    """
+    types = {}
+    for col, col_dict in task_columns.items():
+        if not isinstance(col_dict, dict):
+            continue
+        levels = col_dict.get("Levels")
+        if "Units" in col_dict or (levels and all(_is_number(level) for level in levels)):
+            types[col] = "float64"
+        else:
+            types[col] = "string"
+    return types
+
+
+def _partition_file(store_root, task, subject):
+    return Path(store_root, "{}={}".format(TASK_COLUMN, task), "{}={}".format(SUBJECT_COLUMN, subject),
+                "events.parquet")
+
+
+def _partition_is_current(partition_file, sources):
+    """
+    This function checks whether a partition was built from exactly these events files and is newer than all of
+    them, in which case it does not need to be rebuilt.
+    :param partition_file: (path) parquet file of the partition
+    :param sources: (list of strings) events files of the partition
+    :return: (boolean)
+    """
+    try:
+        partition_mtime = os.stat(partition_file).st_mtime_ns
+        metadata = pq.read_schema(partition_file).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    if json.loads(metadata.get(SOURCES_METADATA_KEY, b"[]")) != sources:
+        return False
+    return all(os.stat(source).st_mtime_ns < partition_mtime for source in sources)
+
+
+def _write_partition(partition_file, sources, column_types):
+    """
+    This function builds the partition of one subject and one task from its events files and saves it to parquet.
+    The columns typed as floats that hold values that are not numbers are stored as strings instead.
+    :param partition_file: (path) parquet file of the partition
+    :param sources: (list of strings) events files of the partition
+    :param column_types: (dict) type of each described column, see events_column_types
+    :return: (int) number of rows of the partition
+    """
+    frames = []
+    for source in sources:
+        events = pd.read_csv(source, sep="\t", dtype=str, na_values=["n/a", ""], keep_default_na=False)
+        entities = dict(part.split("-", 1) for part in Path(source).name.split("_")[:-1] if "-" in part)
+        events.insert(0, SESSION_COLUMN, entities.get("ses"))
+        events.insert(1, RUN_COLUMN, entities.get("run"))
+        frames.append(events)
+    events = pd.concat(frames, ignore_index=True)
+    # All the described columns are stored, even when missing from the files, so that partitions share a schema:
+    events = events.reindex(columns=list(events.columns) + [col for col in column_types if col not in events])
+    for col in events.columns:
+        if column_types.get(col) == "float64":
+            numbers = pd.to_numeric(events[col], errors="coerce")
+            not_numbers = events[col][numbers.isna() & events[col].notna()].unique()
+            if len(not_numbers) == 0:
+                events[col] = numbers
+                continue
+            # The values are kept rather than replaced with missing values:
+            print("WARNING: The column {} of {} is described as numeric but holds values that are not numbers ({}), "
+                  "it is stored as strings!".format(col, partition_file, ", ".join(sorted(not_numbers)[:5])))
+        events[col] = events[col].astype("string")
+    table = pa.Table.from_pandas(events, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           SOURCES_METADATA_KEY: json.dumps(sources).encode()})
+    partition_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = Path(partition_file.parent, partition_file.name + ".tmp")
+    pq.write_table(table, tmp_file)
+    os.replace(tmp_file, partition_file)
+    return len(events)
+
+
+def consolidate_events(bids_root, beh_events_tsvs, events_col_description, n_jobs=1, executor=None,
+                       verbose=True, overwrite=False):
+    """
+    This function consolidates all the events files of the data set into a parquet data set under
+    derivatives/events_store, partitioned by task and subject (bids_task=<label>/bids_subject=<label>/
+    events.parquet), so that analyses read a few typed files instead of thousands of small tsv files. The columns
+    are typed from their description, see events_column_types, and the session and run of each row are added as
+    bids_session and bids_run columns. The store is rebuilt incrementally: only the partitions whose events files
+    changed are rebuilt, and the partitions of subjects or tasks that are gone are deleted. Read it back with
+    read_events_store.
+    :param bids_root: (path) bids root directory
+    :param beh_events_tsvs: (BIDSLayout or iterable of BIDSFile) events files found within the bids directory
+    :param events_col_description: (dict) contains the metadata for each column in the log files associated with each
+    task in this data set
+    :param n_jobs: (int) number of workers building the partitions
+    :param executor: (string, Executor or None) see open_executor. Defaults to processes when n_jobs > 1
+    :param verbose: (boolean)
+    :param overwrite: (boolean) whether to rebuild all the partitions
+    :return: store_root: (path) root of the consolidated store
+    """
+    if not isinstance(beh_events_tsvs, BIDSLayout):
+        beh_events_tsvs = BIDSLayout(beh_events_tsvs)
+    store_root = Path(bids_root, "derivatives", EVENTS_STORE_NAME)
+    store_root.mkdir(parents=True, exist_ok=True)
+    write_if_changed(Path(store_root, "dataset_description.json"), json.dumps({
+        "Name": "Consolidated events",
+        "BIDSVersion": "1.9.0",
+        "DatasetType": "derivative",
+        "GeneratedBy": [{"Name": "bids_converter"}]
+    }, indent=2).encode())
+
+    # List the partitions and their events files:
+    partitions = {}
+    for f in beh_events_tsvs:
+        task, subject = f["task"].split('-')[1], f["subject"].split('-')[1]
+        partitions.setdefault((task, subject), []).append(str(Path(f["file_path"], f["fname"])))
+    to_build = []
+    for (task, subject), sources in partitions.items():
+        partition_file = _partition_file(store_root, task, subject)
+        if overwrite or not _partition_is_current(partition_file, sources):
+            to_build.append((partition_file, sources, events_column_types(events_col_description.get(task, {}))))
+
+    # Delete the partitions that no longer have events files:
+    current_files = {_partition_file(store_root, task, subject) for task, subject in partitions}
+    for partition_file in store_root.glob("{}=*/{}=*/events.parquet".format(TASK_COLUMN, SUBJECT_COLUMN)):
+        if partition_file not in current_files:
+            if verbose:
+                print("=" * 40)
+                print("Deleting {}".format(partition_file))
+            partition_file.unlink()
+
+    with open_executor(executor, n_jobs=n_jobs, default="processes") as pool:
+        for (partition_file, sources, _), n_rows in zip(to_build, imap_ordered(pool, _write_partition, to_build,
+                                                                               max_pending=2 * n_jobs)):
+            if verbose:
+                print("=" * 40)
+                print("Saving {} ({} rows from {} files)".format(partition_file, n_rows, len(sources)))
+    if verbose:
+        print("=" * 40)
+        print("Events store: {} partitions rebuilt, {} up to date".format(len(to_build),
+                                                                        len(partitions) - len(to_build)))
+    return store_root
+
+
+def read_events_store(bids_root, columns=None, filters=None):
+    """
+    This function reads the consolidated events store back into a single data frame. The task and subject are the
+    bids_task and bids_subject columns of the data frame. The schemas of all partitions are unified, so that columns
+    that only exist in some partitions are filled with missing values elsewhere, and columns stored as strings in
+    some partitions are read as strings from all of them.
+    :param bids_root: (path) bids root directory
+    :param columns: (list of strings or None) columns to read, all by default
+    :param filters: (pyarrow expression or None) rows to read, e.g. pyarrow.dataset.field("bids_task") == "prp".
+    Filters on bids_task and bids_subject only read the matching partitions
+    :return: (pandas data frame)
+    """
+    store_root = Path(bids_root, "derivatives", EVENTS_STORE_NAME)
+    files = sorted(str(fl) for fl in store_root.glob("{}=*/{}=*/events.parquet".format(TASK_COLUMN, SUBJECT_COLUMN)))
+    partitioning = ds.partitioning(pa.schema([(TASK_COLUMN, pa.string()), (SUBJECT_COLUMN, pa.string())]),
+                                   flavor="hive")
+    schemas = [pq.read_schema(fl) for fl in files] + [partitioning.schema]
+    # A column stored as floats in some partitions and as strings in others, see _write_partition, is read as strings:
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, set()).add(field.type)
+    as_strings = {name for name, field_types in types.items() if len(field_types - {pa.null()}) > 1}
+    schemas = [pa.schema([field.with_type(pa.large_string()) if field.name in as_strings else field
+                          for field in schema], metadata=schema.metadata) for schema in schemas]
+    schema = pa.unify_schemas(schemas)
+    dataset = ds.dataset(files, schema=schema, format="parquet", partitioning=partitioning,
+                         partition_base_dir=str(store_root))
+    return dataset.to_table(columns=columns, filter=filters).to_pandas()
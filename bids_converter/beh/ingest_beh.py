@@ -0,0 +1,182 @@
+import os
+import errno
+import shutil
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from ..bids import bids_file_path, imap_ordered, match_raw_files, open_executor
+from ..gzip_tsv import GZIP_BLOCK_BYTES, GZIP_EXTENSION, is_gzip_file, write_gzip
+# Ways of placing the raw files in the bids directory, each falling back to a plain copy when not supported:
+LINK_METHODS = ["reflink", "hardlink", "copy"]
+# Linux ioctl cloning a file into another one on file systems supporting it (btrfs, xfs...):
+FICLONE = 0x40049409
+# Errors meaning that the file system cannot reflink or hardlink the files, so that they must be copied:
+_LINK_UNSUPPORTED_ERRNOS = {"EXDEV", "EOPNOTSUPP", "ENOTSUP", "EINVAL", "ENOTTY", "EPERM", "EMLINK", "ENOSYS"}
+
+
+def _raw_extension(raw_file):
+    root, extension = os.path.splitext(raw_file)
+    if extension == GZIP_EXTENSION:
+        extension = os.path.splitext(root)[1] + extension
+    return extension
+
+
+def map_raw_files(raw_root, pattern, datatype="beh", suffix="events", compress=False):
+    """
+    This function lists the raw files matching a filename pattern and maps each of them to its path in the bids
+    directory. The raw files are kept as they are, extension included, so that the logs must already be tab
+    separated.
+    :param raw_root: (path) root directory of the raw files
+    :param pattern: (string) pattern of the raw files paths relative to raw_root, see compile_filename_pattern
+    :param datatype: (string) datatype folder of the bids files
+    :param suffix: (string) suffix of the bids files
+    :param compress: (boolean) whether the bids files are gzipped, i.e. get the .gz extension
+    :return: (list of (string, Path)) each raw file with its path relative to the bids root, sorted by bids path
+    """
+    mapping = {}
+    for raw_file, entities in match_raw_files(raw_root, pattern):
+        extension = _raw_extension(raw_file)
+        if compress and not extension.endswith(GZIP_EXTENSION):
+            extension += GZIP_EXTENSION
+        target = bids_file_path(entities, extension=extension, datatype=datatype, suffix=suffix)
+        assert target not in mapping, "The raw files {} and {} are both mapped to {}!".format(mapping.get(target),
+                                                                                            raw_file, target)
+        mapping[target] = raw_file
+    return [(mapping[target], target) for target in sorted(mapping)]
+
+
+def _reflink(source, target):
+    try:
+        import fcntl
+    except ImportError:
+        # Only available on unix:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _is_unsupported(exc):
+    return errno.errorcode.get(exc.errno) in _LINK_UNSUPPORTED_ERRNOS
+
+
+def ingest_file(source, target, link="reflink", unsupported=None, overwrite=False, compresslevel=6, n_threads=1):
+    """
+    This function places a raw file in the bids directory, unless a file with the same size and mtime is already
+    there. The file is written to a temporary file that is then moved in place, so that an interrupted ingestion
+    never leaves a truncated file behind, and the mtime of the raw file is kept, so that the next ingestion skips
+    it. If the bids file is gzipped but not the raw file, the raw file is compressed instead (see write_gzip), and
+    the file is skipped if its mtime alone is that of the raw file.
+    :param source: (path) raw file
+    :param target: (path) bids file
+    :param link: (string) "reflink": clone the file, sharing its blocks with the raw file until either is modified.
+    "hardlink": link the file, so that the raw and bids files are the same file: never modify the bids file in
+    place. "copy": copy the file. Reflinks and hardlinks fall back to a copy when the file system does not support
+    them
+    :param unsupported: (set or None) link methods found unsupported so far, which are not tried again
+    :param overwrite: (boolean) whether to place the file even if it looks already ingested
+    :param compresslevel: (int) gzip compression level of the compressed files, see compress_member
+    :param n_threads: (int) number of threads compressing the blocks of a compressed file
+    :return: (string) the method used ("reflink", "hardlink", "copy" or "compressed"), or "skipped"
+    """
+    assert link in LINK_METHODS, "The link method must be one of {}, not {}!".format(LINK_METHODS, link)
+    if unsupported is None:
+        unsupported = set()
+    source_stat = os.stat(source)
+    compress = is_gzip_file(target) and not is_gzip_file(source)
+    if not overwrite:
+        try:
+            target_stat = os.stat(target)
+            # The size of a compressed file is not that of the raw file:
+            if target_stat.st_mtime_ns == source_stat.st_mtime_ns and (compress or
+                                                                       target_stat.st_size == source_stat.st_size):
+                return "skipped"
+        except FileNotFoundError:
+            pass
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if compress:
+        with open(source, 'rb') as fl:
+            write_gzip(target, iter(partial(fl.read, GZIP_BLOCK_BYTES), b""), compresslevel=compresslevel,
+                       n_threads=n_threads)
+        os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return "compressed"
+    tmp_file = "{}.{}-{}.tmp".format(target, os.getpid(), threading.get_ident())
+    method = "copy"
+    try:
+        if link != "copy" and link not in unsupported:
+            try:
+                if link == "reflink":
+                    _reflink(source, tmp_file)
+                else:
+                    os.link(source, tmp_file)
+                method = link
+            except OSError as exc:
+                if not _is_unsupported(exc):
+                    raise
+                unsupported.add(link)
+                if os.path.isfile(tmp_file):
+                    os.remove(tmp_file)
+        if method == "copy":
+            shutil.copyfile(source, tmp_file)
+        if method != "hardlink":
+            os.utime(tmp_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        os.replace(tmp_file, target)
+    except BaseException:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return method
+
+
+def ingest_beh_logs(raw_root, bids_root, pattern, link="reflink", compress=False, compresslevel=6, n_threads=1,
+                    n_jobs=1, executor=None, verbose=True, overwrite=False):
+    """
+    This function ingests the raw behavioral logs into the bids directory: each raw file matching the filename
+    pattern is placed at its bids path (sub-<label>/[ses-<label>/]beh/sub-<label>[_ses-<label>]_task-<label>
+    [_acq-<label>][_run-<index>]_events<ext>), ready for beh_bids_metadata. Files already ingested, i.e. with the
+    same size and mtime as the raw file, are skipped, so that re-ingesting an unchanged raw directory only costs a
+    scan. With n_jobs > 1, the files are placed by a pool of threads, which overlaps the copies on network drives.
+    With compress, the logs are gzipped (_events.tsv.gz), which bids allows and which divides their size several
+    fold: the sizes before and after compression are reported.
+    :param raw_root: (path) root directory of the raw files
+    :param bids_root: (path) bids root directory
+    :param pattern: (string) pattern of the raw files paths relative to raw_root, see compile_filename_pattern
+    :param link: (string) "reflink", "hardlink" or "copy", see ingest_file. Only used for the files that are not
+    compressed
+    :param compress: (boolean) whether to gzip the logs
+    :param compresslevel: (int) see ingest_file
+    :param n_threads: (int) number of threads compressing each log, see write_gzip. Only worth it for logs of
+    several MB
+    :param n_jobs: (int) number of workers placing the files
+    :param executor: (string, Executor or None) see open_executor
+    :param verbose: (boolean)
+    :param overwrite: (boolean) whether to place the files even if they look already ingested
+    :return: ingested: (list of Path) the bids files, whether placed or skipped
+    """
+    start = time.perf_counter()
+    files = map_raw_files(raw_root, pattern, compress=compress)
+    # Shared by the threads, so that a method the file system does not support is only tried once:
+    unsupported = set()
+    args_list = ((source, Path(bids_root, target), link, unsupported, overwrite, compresslevel, n_threads)
+                 for source, target in files)
+    counts = {method: 0 for method in LINK_METHODS + ["compressed", "skipped"]}
+    raw_size, compressed_size = 0, 0
+    with open_executor(executor, n_jobs=n_jobs) as pool:
+        for (source, target), method in zip(files, imap_ordered(pool, ingest_file, args_list,
+                                                                max_pending=4 * n_jobs)):
+            counts[method] += 1
+            if method == "compressed":
+                raw_size += os.path.getsize(source)
+                compressed_size += os.path.getsize(Path(bids_root, target))
+            if verbose and method != "skipped":
+                print("=" * 40)
+                print("Ingesting {} to {} ({})".format(source, Path(bids_root, target), method))
+    if verbose:
+        print("=" * 40)
+        print("Ingested {} raw files in {:.1f}s: {reflink} reflinked, {hardlink} hardlinked, {copy} copied, "
+              "{compressed} compressed, {skipped} already ingested".format(len(files), time.perf_counter() - start,
+                                                                           **counts))
+        if raw_size > 0:
+            print("Compressed {:.1f} MB of logs to {:.1f} MB ({:.0%} saved)".format(
+                raw_size / 2 ** 20, compressed_size / 2 ** 20, 1 - compressed_size / raw_size))
+    return [Path(bids_root, target) for _, target in files]
@@ -0,0 +1,256 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from ..bids import imap_ordered, open_executor
+from ..gzip_tsv import open_tsv
+from ..mmap_tsv import MappedTSV
+
+# Maximal number of offending values listed per column in the values report:
+MAX_REPORTED_VALUES = 10
+# Values accepted as missing in any column:
+NA_VALUES = [b"", b"n/a"]
+
+
+def read_tsv_header(tsv_file, block_size=65536):
+    """
+    This function reads the column names of a tsv file without parsing the rest of it. Only the first block of the
+    file is read, which is a single read call for any reasonable header. Gzipped files (.tsv.gz) are decompressed on
+    the fly, so that only their first member is decompressed.
+    :param tsv_file: (path) tsv file to read
+    :param block_size: (int) number of bytes read at once
+    :return: (list of strings) the column names
+    """
+    header = b""
+    with open_tsv(tsv_file, 'rb') as fl:
+        while True:
+            block = fl.read(block_size)
+            header += block
+            if not block or b"\n" in block:
+                break
+    return header.split(b"\n", 1)[0].decode("utf-8-sig").rstrip("\r").split("\t")
+
+
+def _compare_columns(columns, described):
+    missing = [col for col in described if col not in columns]
+    undocumented = [col for col in columns if col not in described]
+    return missing, undocumented
+
+
+def check_events_columns(bids_file, events_col_description):
+    """
+    This function compares the header of an events file to the columns described for its task.
+    :param bids_file: (BIDSFile) events file
+    :param events_col_description: (dict) contains the metadata for each column in the log files associated with each
+    task in this data set
+    :return: missing, undocumented: (lists of strings) the described columns that are not in the file and the
+    columns of the file that are not described
+    """
+    task = bids_file["task"].split('-')[1]
+    columns = read_tsv_header(Path(bids_file["file_path"], bids_file["fname"]))
+    return _compare_columns(columns, list(events_col_description.get(task, {})))
+
+
+def _check_header(bids_file, described):
+    return (bids_file, *_compare_columns(read_tsv_header(Path(bids_file["file_path"], bids_file["fname"])),
+                                         described))
+
+
+def add_events_columns_check(report, bids_file, missing, undocumented):
+    """
+    This function adds the result of check_events_columns for one file to a report, so that the report can be built
+    incrementally while the files are streamed.
+    :param report: (dict) report to update in place, see report_events_columns
+    :param bids_file: (BIDSFile) events file
+    :param missing: (list of strings) described columns missing from the file
+    :param undocumented: (list of strings) columns of the file that are not described
+    :return:
+    """
+    task = bids_file["task"].split('-')[1]
+    task_report = report.setdefault(task, {"n_files": 0, "missing": {}, "undocumented": {}, "files": {}})
+    task_report["n_files"] += 1
+    for col in missing:
+        task_report["missing"][col] = task_report["missing"].get(col, 0) + 1
+    for col in undocumented:
+        task_report["undocumented"][col] = task_report["undocumented"].get(col, 0) + 1
+    if missing or undocumented:
+        events_file = str(Path(bids_file["file_path"], bids_file["fname"]))
+        task_report["files"][events_file] = {"missing": missing, "undocumented": undocumented}
+
+
+def print_events_columns_report(report):
+    """
+    This function prints a summary of the columns report.
+    :param report: (dict) see report_events_columns
+    :return:
+    """
+    for task, task_report in report.items():
+        print("=" * 40)
+        print("task-{}: {} of {} events files do not match the column descriptions".format(
+            task, len(task_report["files"]), task_report["n_files"]))
+        for col, n_files in task_report["missing"].items():
+            print("WARNING: The described column {} is missing from {} files".format(col, n_files))
+        for col, n_files in task_report["undocumented"].items():
+            print("WARNING: The column {} found in {} files is not described".format(col, n_files))
+
+
+def report_events_columns(checks, verbose=True):
+    """
+    This function gathers the results of check_events_columns into a report per task and per file.
+    :param checks: (iterable of (BIDSFile, list, list)) each events file with its missing and undocumented columns
+    :param verbose: (boolean) whether to print a summary of the report
+    :return: report: (dict) for each task (without the task- key), the number of files checked ("n_files"), the
+    number of files missing each described column ("missing"), the number of files holding each undocumented column
+    ("undocumented") and for each file with a mismatch, its missing and undocumented columns ("files")
+    """
+    report = {}
+    for bids_file, missing, undocumented in checks:
+        add_events_columns_check(report, bids_file, missing, undocumented)
+    if verbose:
+        print_events_columns_report(report)
+    return report
+
+
+def validate_events_columns(beh_events_tsvs, events_col_description, n_jobs=1, executor=None, verbose=True):
+    """
+    This function checks that the columns of each events file match the columns described for its task, reading
+    only the header of each file. With n_jobs > 1, the headers are read by a pool of threads, which hides the
+    latency of network drives.
+    :param beh_events_tsvs: (BIDSLayout or iterable of BIDSFile) events files found within the bids directory
+    :param events_col_description: (dict) contains the metadata for each column in the log files associated with each
+    task in this data set
+    :param n_jobs: (int) number of workers reading the headers
+    :param executor: (string, Executor or None) see open_executor
+    :param verbose: (boolean)
+    :return: report: (dict) see report_events_columns
+    """
+    described = {}
+
+    def args_list():
+        for f in beh_events_tsvs:
+            task = f["task"].split('-')[1]
+            # Only the tasks found in the data are looked up, as the descriptions may be loaded lazily:
+            if task not in described:
+                described[task] = list(events_col_description.get(task, {}))
+            yield f, described[task]
+    with open_executor(executor, n_jobs=n_jobs) as pool:
+        return report_events_columns(imap_ordered(pool, _check_header, args_list(), max_pending=4 * n_jobs),
+                                     verbose=verbose)
+
+
+def _values_checks(task_columns):
+    """
+    This function compiles the column descriptions of a task into the checks applied to the values: columns with
+    Levels may only take one of their levels, columns with Units but no Levels must be numeric.
+    :param task_columns: (dict) description of each column of a task
+    :return: (dict) column name -> ("levels", set of strings) or ("numeric", None)
+    """
+    checks = {}
+    for col, col_dict in task_columns.items():
+        if not isinstance(col_dict, dict):
+            continue
+        if "Levels" in col_dict:
+            checks[col] = ("levels", {str(level) for level in col_dict["Levels"]})
+        elif "Units" in col_dict:
+            checks[col] = ("numeric", None)
+    return checks
+
+
+def _non_numeric(values):
+    """
+    This function finds the values that are not numbers.
+    :param values: (numpy array of bytes strings)
+    :return: (numpy array of booleans)
+    """
+    try:
+        values.astype(np.float64)
+        return np.zeros(len(values), dtype=bool)
+    except ValueError:
+        return pd.to_numeric(pd.Series(values).str.decode("utf-8"), errors="coerce").isna().to_numpy()
+
+
+def check_events_values(events_file, checks, chunksize=65536):
+    """
+    This function checks the values of an events file against the checks compiled by _values_checks. Only the
+    checked columns are extracted (see MappedTSV), in blocks of chunksize rows, and each block is checked with
+    vectorized operations on the raw bytes before the next one is read: only the number of offending rows and a few
+    offending values are kept across blocks, so that the memory footprint does not depend on the size of the file.
+    Values are compared to exactly what is written in the file. Missing values (n/a or empty) are always accepted.
+    :param events_file: (path) events file to check
+    :param checks: (dict) see _values_checks
+    :param chunksize: (int) number of rows checked at once
+    :return: violations: (dict) for each column with violations, the number of offending rows ("n_rows") and up to
+    MAX_REPORTED_VALUES of the offending values ("values")
+    """
+    violations = {}
+    with MappedTSV(events_file, block_rows=chunksize) as tsv:
+        columns = [col for col in checks if col in tsv]
+        levels = {col: [level.encode("utf-8") for level in checks[col][1]] for col in columns
+                  if checks[col][0] == "levels"}
+        for block in tsv.iter_blocks(columns):
+            for col, values in block.items():
+                values = values[~np.isin(values, NA_VALUES)]
+                if col in levels:
+                    bad = values[~np.isin(values, levels[col])]
+                else:
+                    bad = values[_non_numeric(values)]
+                if len(bad) == 0:
+                    continue
+                col_violations = violations.setdefault(col, {"n_rows": 0, "values": []})
+                col_violations["n_rows"] += len(bad)
+                for value in pd.unique(bad):
+                    if len(col_violations["values"]) >= MAX_REPORTED_VALUES:
+                        break
+                    value = value.decode("utf-8")
+                    if value not in col_violations["values"]:
+                        col_violations["values"].append(value)
+    # Report the columns in the order of the checks:
+    return {col: violations[col] for col in checks if col in violations}
+
+
+def validate_events_values(beh_events_tsvs, events_col_description, n_jobs=1, executor=None, chunksize=65536,
+                           verbose=True):
+    """
+    This function checks that the values of each events file match their description: values of columns with
+    Levels must be one of the levels and values of columns with Units must be numeric. Only the checked columns of
+    each file are read (see check_events_values). With n_jobs > 1, the files are checked by a pool of processes by
+    default, and only a few files per worker are queued at once, so that only a few files are mapped at once.
+    :param beh_events_tsvs: (BIDSLayout or iterable of BIDSFile) events files found within the bids directory
+    :param events_col_description: (dict) contains the metadata for each column in the log files associated with each
+    task in this data set
+    :param n_jobs: (int) number of workers checking the files
+    :param executor: (string, Executor or None) see open_executor. Defaults to processes when n_jobs > 1
+    :param chunksize: (int) number of rows whose fields are located at once
+    :param verbose: (boolean)
+    :return: report: (dict) for each task (without the task- key), the number of files checked ("n_files"), the
+    total number of offending rows per column ("n_rows") and the violations of each offending file ("files")
+    """
+    tasks_checks = {}
+    events_files = []
+
+    def args_list():
+        for f in beh_events_tsvs:
+            events_files.append(f)
+            task = f["task"].split('-')[1]
+            if task not in tasks_checks:
+                tasks_checks[task] = _values_checks(events_col_description.get(task, {}))
+            yield str(Path(f["file_path"], f["fname"])), tasks_checks[task], chunksize
+
+    report = {}
+    with open_executor(executor, n_jobs=n_jobs, default="processes") as pool:
+        for violations in imap_ordered(pool, check_events_values, args_list(), max_pending=2 * n_jobs):
+            f = events_files.pop(0)
+            task = f["task"].split('-')[1]
+            task_report = report.setdefault(task, {"n_files": 0, "n_rows": {}, "files": {}})
+            task_report["n_files"] += 1
+            for col, col_violations in violations.items():
+                task_report["n_rows"][col] = task_report["n_rows"].get(col, 0) + col_violations["n_rows"]
+            if violations:
+                task_report["files"][str(Path(f["file_path"], f["fname"]))] = violations
+    if verbose:
+        for task, task_report in report.items():
+            print("=" * 40)
+            print("task-{}: {} of {} events files hold values that do not match the column descriptions".format(
+                task, len(task_report["files"]), task_report["n_files"]))
+            for col, n_rows in task_report["n_rows"].items():
+                print("WARNING: {} rows of column {} hold undeclared values".format(n_rows, col))
+    return report
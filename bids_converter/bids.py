@@ -1,73 +1,828 @@
 import os
 import json
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 import pandas as pd
-import numpy as np
 
 
-def walk_bids_root(root_dir, extensions=None):
+# Directory in which the converter keeps its own bookkeeping files within the bids root:
+BIDSCONV_DIR = ".bidsconv"
+WALK_INDEX_FILE = "walk_index.json"
+# Extensions of the events files, which bids allows to be gzipped:
+EVENTS_EXTENSIONS = [".tsv", ".tsv.gz"]
+# Files collected from each datatype folder by scan_bids_datatypes by default:
+DATATYPE_FILTERS = {
+    "beh": {"suffixes": ["events"], "extensions": EVENTS_EXTENSIONS},
+    "eeg": {"suffixes": ["eeg"], "extensions": [".edf", ".vhdr", ".set", ".bdf"]},
+    "ieeg": {"suffixes": ["ieeg"], "extensions": [".edf", ".vhdr", ".set", ".nwb", ".mefd"]},
+    "meg": {"suffixes": ["meg"], "extensions": [".fif", ".ds", ".sqd", ".con"]},
+    "func": {"suffixes": ["bold"], "extensions": [".nii", ".nii.gz"]}
+}
+# Directories modified less than this many nanoseconds before a scan are not cached, as further changes
+# within the same mtime tick would go unnoticed (file systems such as FAT have a 2s mtime resolution):
+_RACY_MTIME_NS = 2 * 10 ** 9
+
+
+# Environment variable selecting how the per-file work is executed when no executor is passed explicitly:
+EXECUTOR_ENV = "BIDS_CONVERTER_EXECUTOR"
+EXECUTORS = ["serial", "threads", "processes"]
+
+
+class SerialExecutor(Executor):
     """
-    This function loops through a nested bids directory and returns every single file within it alongside its actual
-    directory. For each file, it parses each relevant BIDS fields to generate sidecars json files
+    This class runs the submitted calls right away in the calling thread. It has the same interface as the thread
+    and process pools, so that the same code runs serially or in parallel.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+@contextmanager
+def open_executor(executor=None, n_jobs=1, default="threads"):
+    """
+    This function opens the executor running the per-file work. Already opened executors are passed through, so
+    that a single pool can be shared by several steps.
+    :param executor: (string, Executor or None) "serial", "threads" or "processes". If None, it is read from the
+    BIDS_CONVERTER_EXECUTOR environment variable, and falls back to serial if n_jobs is 1 and to default otherwise
+    :param n_jobs: (int) number of workers of the threads and processes executors
+    :param default: (string) executor used when n_jobs > 1 and nothing else is specified
+    :return:
+    """
+    if isinstance(executor, Executor):
+        yield executor
+        return
+    if executor is None:
+        executor = os.environ.get(EXECUTOR_ENV) or ("serial" if n_jobs == 1 else default)
+    assert executor in EXECUTORS, "The executor must be one of {}, not {}!".format(EXECUTORS, executor)
+    if executor == "serial":
+        yield SerialExecutor()
+    elif executor == "threads":
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            yield pool
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            yield pool
+
+
+def imap_ordered(executor, fn, args_list, max_pending):
+    """
+    This function maps a function over arguments with an executor and yields the results in the order of the
+    arguments. Unlike Executor.map, the arguments are submitted lazily with at most max_pending calls in flight,
+    so that arguments streamed from a generator are never all held in memory.
+    :param executor: (Executor) see open_executor
+    :param fn: (callable) function to call. It must be defined at the top level of a module for processes
+    :param args_list: (iterable of tuples) positional arguments of each call
+    :param max_pending: (int) maximal number of calls submitted but not yet returned
+    :return:
+    """
+    pending = deque()
+    for args in args_list:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# BIDS entities parsed from the file names, mapped to the BIDSFile attribute storing them:
+BIDS_ENTITIES = {
+    "sub": "subject",
+    "ses": "session",
+    "task": "task",
+    "acq": "acquisition",
+    "run": "run",
+    "desc": "description"
+}
+
+
+# Entities that can be read from the raw file names, in the order they appear in the bids file names:
+PATTERN_ENTITIES = ["subject", "session", "task", "acquisition", "run"]
+
+
+def compile_filename_pattern(pattern):
+    """
+    This function compiles a declarative pattern of the raw file names into a regular expression. The pattern is the
+    path of the raw files relative to the raw root, using / as separator, in which {subject}, {session}, {task},
+    {acquisition} and {run} stand for the entities and * for any part of a file or folder name. An entity appearing
+    several times must have the same value everywhere. For example, with the pattern
+    "{subject}/{task}/{subject}_{task}_run{run}_*.tsv", the file SX101/prp/SX101_prp_run1_2023.tsv is the run 1 of
+    the task prp of the subject SX101.
+    :param pattern: (string) pattern of the raw files paths
+    :return: (compiled regular expression) matching the raw files paths, with one named group per entity
+    """
+    regex, seen = "", set()
+    for literal, entity in re.findall(r"([^{]*)(?:\{(\w+)\})?", pattern):
+        regex += "[^/]*".join(re.escape(part) for part in literal.split("*"))
+        if not entity:
+            continue
+        assert entity in PATTERN_ENTITIES, "The entity {} of the pattern must be one of {}!".format(entity,
+                                                                                                  PATTERN_ENTITIES)
+        # Bids labels are alphanumeric:
+        regex += "(?P={})".format(entity) if entity in seen else "(?P<{}>[a-zA-Z0-9]+)".format(entity)
+        seen.add(entity)
+    assert {"subject", "task"} <= seen, "The pattern must at least contain {subject} and {task}!"
+    return re.compile(regex + "$")
+
+
+def bids_file_path(entities, datatype="beh", suffix="events", extension=".tsv"):
+    """
+    This function builds the path of a file in the bids directory from its entities.
+    :param entities: (dict) entity name -> label, e.g. {"subject": "SX101", "task": "prp", "run": "1"}. On top of
+    the PATTERN_ENTITIES, the recording entity of physiological recordings is accepted
+    :param datatype: (string) datatype folder of the file
+    :param suffix: (string) suffix of the file
+    :param extension: (string) extension of the file
+    :return: (Path) path of the file relative to the bids root
+    """
+    keys = {**{attr: key for key, attr in BIDS_ENTITIES.items()}, "recording": "recording"}
+    parts = ["{}-{}".format(keys[entity], entities[entity]) for entity in PATTERN_ENTITIES + ["recording"]
+             if entities.get(entity) is not None]
+    folders = parts[:2] if entities.get("session") is not None else parts[:1]
+    return Path(*folders, datatype, "_".join(parts + [suffix]) + extension)
+
+
+def match_raw_files(raw_root, pattern):
+    """
+    This function lists the raw files matching a filename pattern, along with the entities read from their path.
+    :param raw_root: (path) root directory of the raw files
+    :param pattern: (string) pattern of the raw files paths relative to raw_root, see compile_filename_pattern
+    :return: (list of (string, dict)) each raw file with its entities (entity name -> label), in the order of their
+    paths
+    """
+    regex = compile_filename_pattern(pattern)
+    matches = []
+    for dirpath, dirnames, filenames in os.walk(raw_root):
+        dirnames.sort()
+        rel_dir = os.path.relpath(dirpath, raw_root).replace(os.sep, "/")
+        for filename in sorted(filenames):
+            match = regex.match(filename if rel_dir == "." else rel_dir + "/" + filename)
+            if match is not None:
+                matches.append((os.path.join(dirpath, filename), match.groupdict()))
+    return matches
+
+
+def parse_bids_filename(fname):
+    """
+    This function parses the entities of a bids file name in a single pass. Entities are parsed by their key rather
+    than by their position, so that optional entities (ses, acq, run, desc) can be missing. The entities are
+    returned with their key, as they appear in the file name (sub-01, task-prp...), and are interned, as the same
+    few values repeat across all the files of a data set. Entities that are not in BIDS_ENTITIES are ignored.
+    :param fname: (string) name of the file, such as sub-01_ses-1_task-prp_run-1_events.tsv
+    :return: (dict) attribute name -> entity, plus the suffix (events) and the extension (.tsv)
+    """
+    parts = fname.split('_')
+    entities = {}
+    for part in parts[:-1]:
+        key, sep, _ = part.partition('-')
+        if sep and key in BIDS_ENTITIES:
+            entities[BIDS_ENTITIES[key]] = sys.intern(part)
+    suffix, dot, extension = parts[-1].partition('.')
+    entities["suffix"] = sys.intern(suffix)
+    entities["extension"] = sys.intern(dot + extension)
+    return entities
+
+
+class BIDSFile:
+    """
+    This class stores a file found in the bids directory with its parsed entities. It uses slots rather than a dict
+    per file, which keeps the memory footprint low for data sets with millions of files. Entities missing from the
+    file name are None. For compatibility with the former dict records, the fields can also be accessed like dict
+    keys, e.g. bids_file["subject"].
+    """
+    __slots__ = ("file_path", "fname", "datatype", "subject", "session", "task", "acquisition", "run",
+                 "description", "suffix", "extension")
+
+    def __init__(self, file_path, fname, datatype=None, subject=None, session=None, task=None, acquisition=None,
+                 run=None, description=None, suffix=None, extension=None):
+        self.file_path = file_path
+        self.fname = fname
+        self.datatype = datatype
+        self.subject = subject
+        self.session = session
+        self.task = task
+        self.acquisition = acquisition
+        self.run = run
+        self.description = description
+        self.suffix = suffix
+        self.extension = extension
+
+    @classmethod
+    def from_fname(cls, file_path, fname, datatype=None):
+        """
+        This method creates the record of a file by parsing its name, see parse_bids_filename.
+        :param file_path: (string) directory of the file
+        :param fname: (string) name of the file
+        :param datatype: (string) datatype folder the file was found in
+        :return: (BIDSFile)
+        """
+        return cls(file_path, fname, datatype=datatype, **parse_bids_filename(fname))
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, BIDSFile):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __hash__(self):
+        return hash((self.file_path, self.fname))
+
+    def __repr__(self):
+        return "BIDSFile({!r})".format(os.path.join(self.file_path, self.fname))
+
+
+def write_file_atomic(file_name, content):
+    """
+    This function writes content to a file through a temporary file that is then moved in place. The move is
+    atomic, so that an interrupted run never leaves a truncated file behind: the file either holds its former or its
+    new content.
+    :param file_name: (path) file to write
+    :param content: (bytes) content of the file
+    :return:
+    """
+    # The temporary file name is unique to the process and thread, so that concurrent writers never collide:
+    tmp_file = "{}.{}-{}.tmp".format(file_name, os.getpid(), threading.get_ident())
+    try:
+        with open(tmp_file, 'wb') as fl:
+            fl.write(content)
+        os.replace(tmp_file, file_name)
+    except BaseException:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+def write_if_changed(file_name, content):
+    """
+    This function writes content to a file only if the file does not already hold exactly that content, so that
+    unchanged files keep their mtime and are not picked up by backup or synchronization jobs. The size of the file
+    is checked first, so that it is only read when it could be identical.
+    :param file_name: (path) file to write
+    :param content: (bytes) content of the file
+    :return: (boolean) whether the file was written
+    """
+    try:
+        if os.stat(file_name).st_size == len(content):
+            with open(file_name, 'rb') as fl:
+                if fl.read() == content:
+                    return False
+    except OSError:
+        pass
+    write_file_atomic(file_name, content)
+    return True
+
+
+def _load_walk_index(root_dir):
+    """
+    This function loads the persistent directory index of a bids root. The index maps each directory (relative
+    to the root) to its mtime, inode and listing at the time of the last scan. An empty index is returned if
+    the file does not exist or cannot be read.
+    :param root_dir: (path) bids root directory
+    :return: (dict) relative directory path -> [mtime_ns, inode, dirnames, filenames]
+    """
+    index_file = Path(root_dir, BIDSCONV_DIR, WALK_INDEX_FILE)
+    try:
+        with open(index_file, 'r') as fl:
+            return json.load(fl)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_walk_index(root_dir, index):
+    """
+    This function saves the persistent directory index of a bids root. The file is first written to a temporary
+    file and then moved in place, so that an interrupted scan never leaves a truncated index behind.
+    :param root_dir: (path) bids root directory
+    :param index: (dict) directory index, see _merge_walk_index
+    :return:
+    """
+    index_dir = Path(root_dir, BIDSCONV_DIR)
+    index_dir.mkdir(exist_ok=True)
+    write_file_atomic(Path(index_dir, WALK_INDEX_FILE), json.dumps(index).encode())
+
+
+def _merge_walk_index(index, new_index):
+    """
+    This function merges the directories visited by a scan into the index of the previous scans, so that scans
+    restricted to different datatypes or subjects do not drop each other's directories from the index. The
+    directories that are no longer listed by their visited parent directory are dropped along with their
+    sub-directories.
+    :param index: (dict) index of the previous scans, see _load_walk_index
+    :param new_index: (dict) relative directory path -> listing of the directories visited by the scan, None for
+    those that no longer exist, see _list_dir
+    :return: (dict) the merged index
+    """
+    merged = dict(index)
+    merged.update(new_index)
+    removed = set()
+    # Parents before their sub-directories:
+    for key in sorted(merged, key=lambda key: key.count("/") if key != "." else -1):
+        parent, _, name = key.rpartition("/")
+        parent = None if key == "." else parent or "."
+        if merged[key] is None or parent in removed or (parent in merged and name not in merged[parent][2]):
+            removed.add(key)
+    return {key: listing for key, listing in merged.items() if key not in removed}
+
+
+def _scan_dir(dirpath):
+    """
+    This function lists a single directory, separating sub-directories from files the same way os.walk does.
+    :param dirpath: (path) directory to list
+    :return: dirnames, filenames: (lists of strings) sub-directories to descend into and files
+    """
+    dirnames, filenames = [], []
+    with os.scandir(dirpath) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir() and not entry.is_symlink()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dirnames.append(entry.name)
+            else:
+                filenames.append(entry.name)
+    return dirnames, filenames
+
+
+def _list_dir(dirpath, rel_parts, index=None, new_index=None, scan_start_ns=None):
+    """
+    This function lists a single directory of the bids root. If an index from a previous scan is passed and the
+    directory's mtime and inode did not change, its listing is taken from the index so that only a stat is needed.
+    Directories are only listed again when files or sub-directories were added to or removed from them.
+    :param dirpath: (path) directory to list
+    :param rel_parts: (tuple of strings) parts of the directory path relative to the bids root
+    :param index: (dict or None) index of a previous scan, see _load_walk_index
+    :param new_index: (dict or None) if passed, the listing is recorded in it for the next scan
+    :param scan_start_ns: (int) time at which the scan started, directories modified after it are recorded without
+    their mtime, so that their listing is not reused. Directories that cannot be read are recorded as None
+    :return: dirnames, filenames: (lists of strings) or None if the directory cannot be read
+    """
+    listing = None
+    if index is not None or new_index is not None:
+        key = "/".join(rel_parts) or "."
+        try:
+            st = os.stat(dirpath)
+        except OSError:
+            if new_index is not None:
+                new_index[key] = None
+            return None
+        cached = index.get(key) if index is not None else None
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_ino:
+            listing = list(cached[2]), list(cached[3])
+    if listing is None:
+        try:
+            listing = _scan_dir(dirpath)
+        except OSError:
+            return None
+    if new_index is not None:
+        mtime_ns = st.st_mtime_ns if st.st_mtime_ns < scan_start_ns - _RACY_MTIME_NS else None
+        new_index[key] = [mtime_ns, st.st_ino, list(listing[0]), list(listing[1])]
+    if not rel_parts and BIDSCONV_DIR in listing[0]:
+        listing[0].remove(BIDSCONV_DIR)
+    return listing
+
+
+def _walk_dirs(root_dir, rel_parts=(), index=None, new_index=None, scan_start_ns=None):
+    """
+    This function walks a directory top-down like os.walk. For each directory, it yields its path, the parts of
+    that path relative to the root, the sub-directories and the files. As with os.walk, the sub-directories list
+    can be pruned in place to skip them. See _list_dir for the use of the index.
+    :param root_dir: (path) bids root directory
+    :param rel_parts: (tuple of strings) parts of the path of the directory to walk relative to the bids root
+    :param index: (dict or None) index of a previous scan, see _load_walk_index
+    :param new_index: (dict or None) if passed, filled with the index of the current scan
+    :param scan_start_ns: (int) time at which the scan started, defaults to now
+    :return:
+    """
+    if scan_start_ns is None:
+        scan_start_ns = time.time_ns()
+    stack = [(os.path.join(root_dir, *rel_parts), tuple(rel_parts))]
+    while stack:
+        dirpath, rel_parts = stack.pop()
+        listing = _list_dir(dirpath, rel_parts, index=index, new_index=new_index, scan_start_ns=scan_start_ns)
+        if listing is None:
+            continue
+        dirnames, filenames = listing
+        yield dirpath, rel_parts, dirnames, filenames
+        # Push the sub-directories in reverse to visit them in the listing order, as os.walk does:
+        stack.extend((os.path.join(dirpath, d), rel_parts + (d,)) for d in reversed(dirnames))
+
+
+def _prune_bids_dirnames(rel_parts, dirnames, datatypes):
+    """
+    This function prunes the sub-directories of a directory in place according to the BIDS layout
+    sub-<label>/[ses-<label>/]<datatype>/, so that the traversal never enters derivatives, sourcedata, code or any
+    folder that cannot contain raw data of the requested datatypes.
+    :param rel_parts: (tuple of strings) parts of the current directory path relative to the bids root
+    :param dirnames: (list of strings) sub-directories of the current directory, pruned in place
+    :param datatypes: (set of strings or dict) datatype folders to descend into (beh, eeg...)
+    :return:
+    """
+    depth = len(rel_parts)
+    if depth == 0:
+        dirnames[:] = [d for d in dirnames if d.startswith("sub-")]
+    elif depth == 1:
+        dirnames[:] = [d for d in dirnames if d.startswith("ses-") or d in datatypes]
+    elif depth == 2 and rel_parts[1].startswith("ses-"):
+        dirnames[:] = [d for d in dirnames if d in datatypes]
+    else:
+        # Datatype folders are the leaves of the bids tree:
+        dirnames[:] = []
+
+
+def _match_filter(bids_file, file_filter):
+    suffixes, extensions = file_filter
+    if suffixes is not None and bids_file.suffix not in suffixes:
+        return False
+    return extensions is None or bids_file.extension in extensions
+
+
+def _walk_bids_subject(root_dir, subject, filters, index=None, new_index=None, scan_start_ns=None):
+    """
+    This function walks the folder of a single subject and returns the files found in its datatype folders.
+    :param root_dir: (path) bids root directory
+    :param subject: (string) name of the subject folder (sub-<label>)
+    :param filters: (dict) datatype folder to look for files in -> (suffixes, extensions) of the files to return,
+    each a set of strings or None for any, see _compile_filters
+    :param index: (dict or None) see _walk_dirs
+    :param new_index: (dict or None) see _walk_dirs
+    :param scan_start_ns: (int) see _walk_dirs
+    :return: files_infos: (list of BIDSFile) the files found in this subject's folder
+    """
+    files_infos = []
+    for dirpath, rel_parts, dirnames, filenames in _walk_dirs(root_dir, (subject,), index=index,
+                                                              new_index=new_index, scan_start_ns=scan_start_ns):
+        # Some formats are stored as folders (CTF .ds, MEF3 .mefd), which bids treats as files:
+        entries = filenames + dirnames
+        _prune_bids_dirnames(rel_parts, dirnames, filters)
+        if len(rel_parts) < 2 or rel_parts[-1] not in filters:
+            continue
+        # All the files of a folder share the same path string:
+        dirpath = sys.intern(dirpath)
+        datatype = sys.intern(rel_parts[-1])
+        file_filter = filters[datatype]
+        for filename in entries:
+            bids_file = BIDSFile.from_fname(dirpath, filename, datatype=datatype)
+            if _match_filter(bids_file, file_filter):
+                files_infos.append(bids_file)
+    return files_infos
+
+
+def _compile_filters(filters):
+    """
+    This function converts the suffixes and extensions of each datatype to sets, for the lookups of the walk.
+    :param filters: (dict) datatype -> {"suffixes": list of strings or None, "extensions": list of strings or None}
+    :return: (dict) datatype -> (suffixes, extensions)
+    """
+    compiled = {}
+    for datatype, file_filter in filters.items():
+        suffixes, extensions = file_filter.get("suffixes"), file_filter.get("extensions")
+        compiled[datatype] = (None if suffixes is None else set(suffixes),
+                              None if extensions is None else set(extensions))
+    return compiled
+
+
+def _iter_filtered_files(root_dir, filters, use_index=False, n_jobs=1):
+    """
+    This function walks the bids root once and yields the files matching the filters of their datatype folder, see
+    iter_bids_files.
+    :param root_dir: (path) bids root directory
+    :param filters: (dict) see _walk_bids_subject
+    :param use_index: (boolean) see walk_bids_root
+    :param n_jobs: (int) see walk_bids_root
+    :return:
+    """
+    index, new_index = None, None
+    if use_index:
+        index, new_index = _load_walk_index(root_dir), {}
+    scan_start_ns = time.time_ns()
+    # List the subjects at the root of the bids directory:
+    listing = _list_dir(root_dir, (), index=index, new_index=new_index, scan_start_ns=scan_start_ns)
+    subjects = listing[0] if listing is not None else []
+    _prune_bids_dirnames((), subjects, filters)
+
+    # Walk each subject's folder. The threads only ever write distinct keys of new_index, which is safe:
+    def walk_subject(subject):
+        return _walk_bids_subject(root_dir, subject, filters, index=index, new_index=new_index,
+                                  scan_start_ns=scan_start_ns)
+    if n_jobs == 1:
+        for subject in subjects:
+            yield from walk_subject(subject)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            # map returns the subjects in order, each as soon as it and the ones before it are scanned:
+            for subject_files in executor.map(walk_subject, subjects):
+                yield from subject_files
+    if use_index:
+        _save_walk_index(root_dir, _merge_walk_index(index, new_index))
+
+
+def iter_bids_files(root_dir, extensions=None, use_index=False, datatypes=None, n_jobs=1, suffixes=None):
+    """
+    This function is the generator version of walk_bids_root: it yields the files one by one as they are found, so
+    that they can be processed while the rest of the bids directory is still being scanned. The parameters are the
+    same as walk_bids_root. The persistent index is only saved once the generator is exhausted.
     :param root_dir:
     :param extensions:
+    :param use_index:
+    :param datatypes:
+    :param n_jobs:
+    :param suffixes:
     :return:
     """
     if extensions is None:
-        extensions = [".tsv"]
-    files_infos = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if 'events' in filename and 'beh' in dirpath:
-                # Extract details from the filename
-                parts = filename.split('_')
-                # Get all the parts of that file:
-                bids_path = {
-                    "file_path": dirpath,
-                    "fname": filename,
-                    "subject": parts[0],
-                    "session": parts[1],
-                    "run": parts[2],
-                    "task": parts[3]
-                }
-                files_infos.append(bids_path)
+        extensions = EVENTS_EXTENSIONS
+    if suffixes is None:
+        suffixes = ["events"]
+    if datatypes is None:
+        datatypes = ["beh"]
+    filters = _compile_filters({datatype: {"suffixes": suffixes, "extensions": extensions}
+                                for datatype in datatypes})
+    return _iter_filtered_files(root_dir, filters, use_index=use_index, n_jobs=n_jobs)
 
-    return files_infos
 
+def walk_bids_root(root_dir, extensions=None, use_index=False, datatypes=None, n_jobs=1, suffixes=None):
+    """
+    This function loops through a nested bids directory and returns every single file within it alongside its actual
+    directory. For each file, it parses each relevant BIDS fields to generate sidecars json files
+    :param root_dir:
+    :param extensions: (list of strings) extensions of the events files to return, so that the events sidecars
+    (_events.json) are not mistaken for events files. Default: EVENTS_EXTENSIONS, i.e. both plain and gzipped tsv
+    :param use_index: (boolean) whether to keep a persistent index of the directory listings under
+    bids_root/.bidsconv/. On subsequent scans, only the directories whose mtime changed are listed again,
+    which is much faster on network shares
+    :param datatypes: (list of strings) datatype folders to look for files in. Only the sub-<label>/[ses-<label>/]
+    <datatype>/ folders are visited, all other folders (derivatives, sourcedata...) are skipped. Default: ["beh"]
+    :param n_jobs: (int) number of threads used to scan the subjects folders in parallel. On network drives, most
+    of the scanning time is spent waiting for the directory listings, so that several threads speed it up a lot.
+    The files are returned in the same order whatever the number of threads
+    :param suffixes: (list of strings) suffixes of the files to return. Default: ["events"]
+    :return:
+    """
+    return list(iter_bids_files(root_dir, extensions=extensions, use_index=use_index, datatypes=datatypes,
+                                n_jobs=n_jobs, suffixes=suffixes))
 
-def create_participants_tsv(bids_root, beh_events_tsvs, verbose=True, overwrite=False):
+
+def scan_bids_datatypes(root_dir, filters=None, use_index=False, n_jobs=1):
+    """
+    This function collects the files of several datatypes in a single walk of the bids root, sorting them into one
+    bucket per datatype. Each datatype has its own suffixes and extensions, so that for example the events of the
+    beh folders and the recordings of the ieeg folders are found together: converters of different modalities can
+    then share one scan of a large data set instead of walking it once each.
+        files = scan_bids_datatypes(bids_root)
+        files["beh"], files["ieeg"]
+    :param root_dir: (path) bids root directory
+    :param filters: (dict) datatype -> {"suffixes": [...], "extensions": [...]}, None (or a missing key) for any
+    suffix or extension. Default: DATATYPE_FILTERS
+    :param use_index: (boolean) see walk_bids_root
+    :param n_jobs: (int) see walk_bids_root
+    :return: (dict) datatype -> list of BIDSFile, in the same order as walk_bids_root. Every datatype of the filters
+    has a bucket, empty if no file was found
+    """
+    if filters is None:
+        filters = DATATYPE_FILTERS
+    buckets = {datatype: [] for datatype in filters}
+    for bids_file in _iter_filtered_files(root_dir, _compile_filters(filters), use_index=use_index, n_jobs=n_jobs):
+        buckets[bids_file.datatype].append(bids_file)
+    return buckets
+
+
+class BIDSLayout:
+    """
+    This class indexes the files of a bids directory by entity, so that queries such as "all the files of task X"
+    or "all the subjects" do not need to go through the whole list of files. The index is built once, for example
+    from a scan of the bids root:
+        layout = BIDSLayout.from_bids_root(bids_root)
+        layout.get(task="prp", session="ses-1")
+        layout.get_subjects()
+    Entities can be queried with or without their key (subject="sub-01" or subject="01"). The files are always
+    returned in the order in which they were added.
+    """
+    # Fields of the BIDSFile records that are indexed:
+    INDEXED_ENTITIES = ("datatype", "subject", "session", "task", "acquisition", "run", "description", "suffix",
+                        "extension")
+    _ENTITY_KEYS = {attr: key for key, attr in BIDS_ENTITIES.items()}
+
+    def __init__(self, files=()):
+        self.files = []
+        # For each entity, map each value to the (sorted) positions of the files having that value:
+        self._index = {entity: {} for entity in self.INDEXED_ENTITIES}
+        for bids_file in files:
+            self.add(bids_file)
+
+    @classmethod
+    def from_bids_root(cls, root_dir, **kwargs):
+        """
+        This method builds the layout of a bids directory. The keyword arguments are passed to iter_bids_files.
+        :param root_dir: (path) bids root directory
+        :return: (BIDSLayout)
+        """
+        return cls(iter_bids_files(root_dir, **kwargs))
+
+    def add(self, bids_file):
+        """
+        This method adds a single file to the layout.
+        :param bids_file: (BIDSFile)
+        :return:
+        """
+        position = len(self.files)
+        self.files.append(bids_file)
+        for entity, values in self._index.items():
+            values.setdefault(getattr(bids_file, entity), []).append(position)
+
+    def _normalize(self, entity, value):
+        key = self._ENTITY_KEYS.get(entity)
+        if key is not None and value is not None and not str(value).startswith(key + "-"):
+            return "{}-{}".format(key, value)
+        return value
+
+    def get(self, **filters):
+        """
+        This method returns the files matching all the passed entities, e.g. layout.get(task="prp", run="run-1").
+        Passing None for an entity returns the files that do not have it. A list of values matches any of them.
+        :return: (list of BIDSFile)
+        """
+        if not filters:
+            return list(self.files)
+        matches = []
+        for entity, value in filters.items():
+            if entity not in self._index:
+                raise KeyError("{} is not an indexed entity, use one of {}".format(entity, self.INDEXED_ENTITIES))
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            positions = []
+            for val in values:
+                positions.extend(self._index[entity].get(self._normalize(entity, val), []))
+            matches.append(positions)
+        # Intersect starting from the most selective entity:
+        matches.sort(key=len)
+        positions = set(matches[0])
+        for other in matches[1:]:
+            positions.intersection_update(other)
+        return [self.files[position] for position in sorted(positions)]
+
+    def get_entity_values(self, entity):
+        """
+        This method returns the values an entity takes across the data set, in the order they were found. Files
+        missing the entity are not reflected.
+        :param entity: (string) one of INDEXED_ENTITIES
+        :return: (list)
+        """
+        return [value for value in self._index[entity] if value is not None]
+
+    def get_subjects(self):
+        return self.get_entity_values("subject")
+
+    def get_sessions(self):
+        return self.get_entity_values("session")
+
+    def get_tasks(self):
+        return self.get_entity_values("task")
+
+    def get_datatypes(self):
+        return self.get_entity_values("datatype")
+
+    def __len__(self):
+        return len(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+
+def read_table(table_file, dtype=None):
+    """
+    This function reads a table from a csv, tsv, Excel or Parquet file, depending on its extension. Text files can be
+    gzipped (.tsv.gz, .csv.gz).
+    :param table_file: (path) file to read
+    :param dtype: (dict or None) type of some of the columns of the text and Excel files, Parquet files store the
+    types of their columns
+    :return: (pandas data frame)
+    """
+    extension = Path(table_file).suffix.lower()
+    if extension == ".gz":
+        # Decompressed by pandas:
+        extension = Path(Path(table_file).stem).suffix.lower()
+    if extension in [".xls", ".xlsx"]:
+        return pd.read_excel(table_file, dtype=dtype)
+    if extension == ".parquet":
+        return pd.read_parquet(table_file)
+    return pd.read_csv(table_file, sep="\t" if extension == ".tsv" else ",", na_values="n/a", dtype=dtype)
+
+
+def _load_demographics(demographics):
+    """
+    This function loads the demographics of the participants and normalizes their identifiers to sub-<label>.
+    :param demographics: (path or pandas data frame) table with one row per participant and a participant_id column
+    :return: (pandas data frame)
+    """
+    if not isinstance(demographics, pd.DataFrame):
+        # Read the identifiers as text, so that labels such as 01 keep their leading zeros:
+        demographics = read_table(demographics, dtype={"participant_id": str})
+    assert "participant_id" in demographics.columns, "The demographics must have a participant_id column!"
+    demographics = demographics.copy()
+    participant_id = demographics["participant_id"].astype(str)
+    demographics["participant_id"] = participant_id.where(participant_id.str.startswith("sub-"),
+                                                          "sub-" + participant_id)
+    return demographics.drop_duplicates("participant_id", keep="last")
+
+
+def _read_participants_tsv(participants_tsv_file):
+    """
+    This function reads an existing participants tsv as text, so that its values are written back as they are. The
+    index column written by former versions of the converter (with an empty header, read as "Unnamed: 0") is
+    dropped, as it is not a bids column.
+    :param participants_tsv_file: (path) participants tsv file
+    :return: existing_tsv, legacy: (pandas data frame, boolean) the content of the file and whether it had the index
+    column
     """
-    This files creates the participants tsv at the root of the bids directory
+    existing_tsv = pd.read_csv(participants_tsv_file, sep="\t", dtype=str, na_values=["n/a", ""],
+                               keep_default_na=False)
+    index_columns = [col for col in existing_tsv.columns if re.fullmatch(r"Unnamed: \d+", col)]
+    return existing_tsv.drop(columns=index_columns), len(index_columns) > 0
+
+
+def create_participants_tsv(bids_root, beh_events_tsvs, verbose=True, overwrite=False, demographics=None):
+    """
+    This files creates the participants tsv at the root of the bids directory. The participants are sorted by
+    identifier and their age, sex and any other column are taken from the demographics table if one is passed,
+    with a single merge on participant_id. If the file already exists and overwrite is False, it is updated rather
+    than rewritten: the participants that are not yet in the file are added and the cells that are empty (n/a) in
+    the file are filled from the demographics, but no value of the file is ever replaced. The file is only written
+    if this changes its content.
     :param bids_root:
-    :param beh_events_tsvs:
+    :param beh_events_tsvs: (BIDSLayout or list of BIDSFile) files found within the bids directory
     :param verbose:
     :param overwrite:
-    :return:
+    :param demographics: (path, pandas data frame or None) csv, tsv, Excel or Parquet table with a participant_id
+    column (with or without the sub- key) and a column per participant attribute (age, sex...)
+    :return: participants_tsv: (pandas data frame) the content of the participants tsv file
     """
     if verbose:
         print("=" * 40)
         print("Create the participants tsv file")
     # Extract all subjects found within the data set:
-    subjects_list = list(set([fl["subject"] for fl in beh_events_tsvs]))
+    if not isinstance(beh_events_tsvs, BIDSLayout):
+        beh_events_tsvs = BIDSLayout(beh_events_tsvs)
+    subjects_list = sorted(beh_events_tsvs.get_subjects())
 
     # Create pandas data frame:
-    participants_tsv = pd.DataFrame({
-        "participant_id": subjects_list,
-        "age": [np.nan] * len(subjects_list),
-        "sex": [np.nan] * len(subjects_list)
-    })
+    participants_tsv = pd.DataFrame({"participant_id": subjects_list})
+    if demographics is not None:
+        participants_tsv = participants_tsv.merge(_load_demographics(demographics), on="participant_id", how="left")
+        # Keep integer columns (age...) as integers despite the participants missing from the demographics:
+        participants_tsv = participants_tsv.convert_dtypes()
+    columns = ["participant_id", "age", "sex"]
+    participants_tsv = participants_tsv.reindex(
+        columns=columns + [col for col in participants_tsv.columns if col not in columns])
     participants_tsv_file = Path(bids_root, "participants.tsv")
     # Save to file:
     if os.path.isfile(participants_tsv_file) and not overwrite:
-        if verbose:
+        existing_tsv, legacy = _read_participants_tsv(participants_tsv_file)
+        new_tsv = participants_tsv.astype("string").set_index("participant_id")
+        n_new = (~new_tsv.index.isin(existing_tsv["participant_id"])).sum()
+        # The values of the file take precedence, the new ones only fill its gaps and its missing participants:
+        participants_tsv = existing_tsv.set_index("participant_id").combine_first(new_tsv)
+        participants_tsv = participants_tsv.reindex(
+            columns=[col for col in existing_tsv.columns if col != "participant_id"] +
+                    [col for col in new_tsv.columns if col not in existing_tsv.columns])
+        participants_tsv = participants_tsv.sort_index().rename_axis("participant_id").reset_index()
+        content = participants_tsv.to_csv(sep="\t", index=False, na_rep="n/a").encode()
+        if not write_if_changed(participants_tsv_file, content):
+            if verbose:
+                print("=" * 40)
+                print("The file {} is already up to date. If you want to overwrite it, set overwrite to "
+                      "true!".format(participants_tsv_file))
+        elif verbose:
             print("=" * 40)
-            print("WARNING: The file {} already exists. If you want to overwrite it, set overwrite to true!"
-                  .format(participants_tsv_file))
+            print("Updating {}: {} participants added{}".format(participants_tsv_file, n_new,
+                                                                ", former index column removed" if legacy else ""))
     else:
         if verbose:
             print("=" * 40)
             print("Saving {}".format(participants_tsv_file))
-        participants_tsv.to_csv(participants_tsv_file, sep="\t")
+        participants_tsv.to_csv(participants_tsv_file, sep="\t", index=False, na_rep="n/a")
     return participants_tsv
 
 
@@ -89,7 +844,14 @@ def create_participants_json(bids_root, participants_tsv, verbose=True, overwrit
 
     # Loop through each of the column
     for col in cols:
-        if col == "age":
+        if col == "participant_id":
+            col_dict = {
+                "participant_id": {
+                    "Description": "Unique participant identifier"
+                }
+            }
+            participants_json.update(col_dict)
+        elif col == "age":
             col_dict = {
                 "age": {
                     "Description": "Age of the participant",
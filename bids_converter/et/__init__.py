@@ -0,0 +1,3 @@
+from .convert_et import (
+    et_bids_conversion
+)
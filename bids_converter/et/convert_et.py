@@ -0,0 +1,197 @@
+import json
+import itertools
+from pathlib import Path
+import pandas as pd
+from ..bids import bids_file_path, imap_ordered, match_raw_files, open_executor, write_file_atomic
+from ..gzip_tsv import write_gzip
+
+# Number of timestamp units per second, to derive the sampling frequency from the timestamps:
+TIMESTAMP_UNITS = {"s": 1, "ms": 1000, "us": 10 ** 6}
+
+
+def convert_gaze_samples(raw_file, physio_file, columns, sep="\t", na_values=None, chunksize=100000,
+                         compresslevel=6, n_threads=1):
+    """
+    This function converts a file of gaze samples to a bids physio file: a gzipped tsv file without header, holding
+    one row per sample. The raw file is read in chunks of chunksize samples, each of which is compressed to a gzip
+    member and written before the next ones are read (see write_gzip), so that the memory footprint is bounded by the
+    chunk size whatever the length of the recording. The values are read as strings, so that they are written as
+    they are in the raw file without the cost of parsing them, the missing ones as n/a.
+    :param raw_file: (path) file of gaze samples, with a header
+    :param physio_file: (path) physio file to write (..._physio.tsv.gz)
+    :param columns: (dict) name of each column of the raw file to convert -> its name in the physio file (timestamp,
+    x_coordinate, y_coordinate, pupil_size...), in the order of the physio file. One of them must be the timestamp
+    :param sep: (string) separator of the raw file
+    :param na_values: (list of strings or None) values of the raw file, beside empty ones, meaning that the sample is
+    missing (e.g. "." for eyelink files), written as n/a
+    :param chunksize: (int) number of samples read at once
+    :param compresslevel: (int) gzip compression level, from 1 (fastest) to 9 (smallest)
+    :param n_threads: (int) number of threads compressing the chunks while the next ones are read
+    :return: n_samples, first_timestamp, timestamp_step: (int, float, float) the number of samples, the first
+    timestamp and the median step between the timestamps of the first chunk. If the raw file holds no samples, the
+    physio file is not written and 0, None, None is returned
+    """
+    timestamp_col = [col for col, bids_col in columns.items() if bids_col == "timestamp"]
+    assert len(timestamp_col) == 1, "One of the columns must be converted to the timestamp column!"
+    n_samples = 0
+
+    def blocks(chunks):
+        nonlocal n_samples
+        for chunk in chunks:
+            n_samples += len(chunk)
+            yield chunk[list(columns)].to_csv(sep="\t", header=False, index=False, na_rep="n/a").encode()
+
+    with pd.read_csv(raw_file, sep=sep, usecols=list(columns), dtype=str, keep_default_na=False,
+                     na_values=[""] + list(na_values or []), chunksize=chunksize) as reader:
+        first_chunk = next(reader, None)
+        # A file with a header only gives no physio file rather than an empty one:
+        if first_chunk is None or len(first_chunk) == 0:
+            return 0, None, None
+        timestamps = pd.to_numeric(first_chunk[timestamp_col[0]])
+        first_timestamp = timestamps.iloc[0].item()
+        timestamp_step = timestamps.diff().median().item() if len(first_chunk) > 1 else None
+        write_gzip(physio_file, blocks(itertools.chain([first_chunk], reader)), compresslevel=compresslevel,
+                   n_threads=n_threads)
+    return n_samples, first_timestamp, timestamp_step
+
+
+def convert_et_subject(recordings, bids_root, columns, datatype="beh", recording="eye1", sampling_frequency=None,
+                       timestamp_units="ms", start_timestamp=None, sidecar_metadata=None, sep="\t", na_values=None,
+                       chunksize=100000, compresslevel=6, n_threads=1, overwrite=False):
+    """
+    This function converts the gaze samples files of one subject to bids physio files and their json sidecars, one
+    after the other.
+    :param recordings: (list of (string, dict)) raw file of each recording with its entities, see match_raw_files
+    :param bids_root: (path) bids root directory
+    :param columns: (dict) see convert_gaze_samples
+    :param datatype: (string) datatype folder the physio files are written to, i.e. that of the data recorded along
+    with the eyetracking
+    :param recording: (string) label of the recording entity of the physio files
+    :param sampling_frequency: (float or None) sampling frequency of the eyetracker. If None, it is derived from the
+    timestamps of each recording
+    :param timestamp_units: (string) units of the timestamps, see TIMESTAMP_UNITS
+    :param start_timestamp: (float, dict or None) timestamp, in timestamp_units, of the onset 0 of the data recorded
+    along with the eyetracking (e.g. of the events file), or a dict giving it for each raw file name. The StartTime of
+    each sidecar is the time of the first sample relative to it, in seconds. If None, StartTime must be given in
+    sidecar_metadata
+    :param sidecar_metadata: (dict or None) further fields of the sidecars (Manufacturer, RecordedEye...)
+    :param sep: (string) see convert_gaze_samples
+    :param na_values: (list of strings or None) see convert_gaze_samples
+    :param chunksize: (int) see convert_gaze_samples
+    :param compresslevel: (int) see convert_gaze_samples
+    :param n_threads: (int) see convert_gaze_samples
+    :param overwrite: (boolean) whether to convert the recordings whose physio file already exists
+    :return: (list of (Path, int or None)) each physio file with its number of samples, None if it already existed
+    and 0 if the raw file holds no samples, in which case neither the physio file nor its sidecar is written
+    """
+    assert start_timestamp is not None or "StartTime" in (sidecar_metadata or {}), \
+        "The StartTime of the recordings must be computed from start_timestamp or given in sidecar_metadata!"
+    converted = []
+    for raw_file, entities in recordings:
+        physio_file = Path(bids_root, bids_file_path({**entities, "recording": recording}, datatype=datatype,
+                                                     suffix="physio", extension=".tsv.gz"))
+        if physio_file.is_file() and not overwrite:
+            converted.append((physio_file, None))
+            continue
+        physio_file.parent.mkdir(parents=True, exist_ok=True)
+        n_samples, first_timestamp, timestamp_step = convert_gaze_samples(
+            raw_file, physio_file, columns, sep=sep, na_values=na_values, chunksize=chunksize,
+            compresslevel=compresslevel, n_threads=n_threads)
+        if n_samples == 0:
+            converted.append((physio_file, 0))
+            continue
+        sidecar_start = {}
+        if start_timestamp is not None:
+            start = start_timestamp[Path(raw_file).name] if isinstance(start_timestamp, dict) else start_timestamp
+            sidecar_start["StartTime"] = (first_timestamp - start) / TIMESTAMP_UNITS[timestamp_units]
+        frequency = sampling_frequency
+        if frequency is None and timestamp_step:
+            frequency = TIMESTAMP_UNITS[timestamp_units] / timestamp_step
+        sidecar = {
+            "SamplingFrequency": frequency,
+            **sidecar_start,
+            "Columns": list(columns.values()),
+            "PhysioType": "eyetrack",
+            "timestamp": {
+                "Description": "Timestamp issued by the eye-tracker indexing the continuous recordings. The first "
+                               "sample was recorded at {}".format(first_timestamp),
+                "Units": timestamp_units
+            },
+            **(sidecar_metadata or {})
+        }
+        write_file_atomic(Path(str(physio_file).replace(".tsv.gz", ".json")), json.dumps(sidecar, indent=2).encode())
+        converted.append((physio_file, n_samples))
+    return converted
+
+
+def et_bids_conversion(raw_root, bids_root, pattern, columns, subjects=None, task=None, datatype="beh",
+                       recording="eye1", sampling_frequency=None, timestamp_units="ms", start_timestamp=None,
+                       sidecar_metadata=None, sep="\t", na_values=None, chunksize=100000, compresslevel=6, n_threads=1,
+                       n_jobs=1, executor=None, verbose=True, overwrite=False):
+    """
+    This function converts the eyetracking gaze samples of a data set to bids physio files
+    (sub-<label>[_ses-<label>]_task-<label>[_run-<index>]_recording-<label>_physio.tsv.gz) and their json sidecars,
+    following the bids eyetracking extension. The raw samples files are found with a filename pattern (e.g.
+    "{subject}/{subject}_{task}_run{run}_samples.tsv", see compile_filename_pattern). Each file is converted in
+    chunks with streaming gzip compression (see convert_gaze_samples), so that recordings of several GB never load
+    in memory, and the subjects are converted in parallel by a pool of processes.
+    :param raw_root: (path) root directory of the raw samples files
+    :param bids_root: (path) bids root directory
+    :param pattern: (string) pattern of the raw samples files paths relative to raw_root
+    :param columns: (dict) see convert_gaze_samples, e.g. {"time": "timestamp", "gx": "x_coordinate", "gy":
+    "y_coordinate", "pa": "pupil_size"}
+    :param subjects: (list of strings or None) labels of the subjects to convert, e.g.
+    environment_variables.subjects_lists_et["prp"]. All the subjects found by default
+    :param task: (string or None) task to convert. All the tasks found by default
+    :param datatype: (string) see convert_et_subject
+    :param recording: (string) see convert_et_subject
+    :param sampling_frequency: (float or None) see convert_et_subject
+    :param timestamp_units: (string) see convert_et_subject
+    :param start_timestamp: (float, dict or None) see convert_et_subject
+    :param sidecar_metadata: (dict or None) see convert_et_subject
+    :param sep: (string) see convert_gaze_samples
+    :param na_values: (list of strings or None) see convert_gaze_samples
+    :param chunksize: (int) see convert_gaze_samples
+    :param compresslevel: (int) see convert_gaze_samples
+    :param n_threads: (int) number of threads compressing each physio file, see convert_gaze_samples
+    :param n_jobs: (int) number of subjects converted in parallel
+    :param executor: (string, Executor or None) see open_executor. Defaults to processes when n_jobs > 1
+    :param verbose: (boolean)
+    :param overwrite: (boolean) whether to convert the recordings whose physio file already exists
+    :return: physio_files: (list of Path) the physio files of all the recordings holding samples
+    """
+    assert timestamp_units in TIMESTAMP_UNITS, "The timestamp units must be one of {}, not {}!".format(
+        list(TIMESTAMP_UNITS), timestamp_units)
+    subjects_recordings = {}
+    for raw_file, entities in match_raw_files(raw_root, pattern):
+        if (subjects is None or entities["subject"] in subjects) and (task is None or entities["task"] == task):
+            subjects_recordings.setdefault(entities["subject"], []).append((raw_file, entities))
+    args_list = ((recordings, bids_root, columns, datatype, recording, sampling_frequency, timestamp_units,
+                  start_timestamp, sidecar_metadata, sep, na_values, chunksize, compresslevel, n_threads, overwrite)
+                 for recordings in subjects_recordings.values())
+    physio_files = []
+    with open_executor(executor, n_jobs=n_jobs, default="processes") as pool:
+        for converted in imap_ordered(pool, convert_et_subject, args_list, max_pending=2 * n_jobs):
+            for physio_file, n_samples in converted:
+                if n_samples != 0:
+                    physio_files.append(physio_file)
+                if not verbose:
+                    continue
+                print("=" * 40)
+                if n_samples == 0:
+                    print("WARNING: The raw file of {} holds no samples, it is skipped!".format(physio_file))
+                elif n_samples is None:
+                    print("WARNING: The file {} already exists. If you want to overwrite it, set overwrite to true!"
+                          .format(physio_file))
+                else:
+                    print("Saving {} ({} samples)".format(physio_file, n_samples))
+    return physio_files
+
+
+if __name__ == "__main__":
+    from ..example_var import ev
+    for et_task, et_subjects in ev.subjects_lists_et.items():
+        et_bids_conversion(ev.raw_root, ev.bids_root, "{subject}/{subject}_{task}_run{run}_samples.tsv",
+                           {"time": "timestamp", "gx": "x_coordinate", "gy": "y_coordinate", "pa": "pupil_size"},
+                           subjects=et_subjects, task=et_task, na_values=["."], n_jobs=4, verbose=True,
+                           sidecar_metadata={"StartTime": 0})
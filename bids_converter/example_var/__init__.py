@@ -1,3 +1,14 @@
-from .logs_metadata_prp import logs_column_descriptions
-from .task_desc_prp import tasks_descriptions
-import environment_variables as ev
\ No newline at end of file
+from pathlib import Path
+from ..task_metadata import TaskRegistry
+
+# The metadata of each task is only loaded when the task is accessed:
+tasks = TaskRegistry(Path(__file__).parent / "tasks")
+tasks_descriptions, logs_column_descriptions = tasks.descriptions, tasks.columns
+
+
+def __getattr__(name):
+    # The study settings (paths, colors, subjects lists...) are only evaluated when used:
+    if name == "ev":
+        from . import environment_variables as ev
+        return ev
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
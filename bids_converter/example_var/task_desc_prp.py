@@ -1,31 +0,0 @@
-tasks_descriptions = {
-    "prp": "Participants were presented with two conscecutive tasks. The first (T1) consisted of visual stimuli of "
-           "4 different categories (faces, objects, letters and symbols) being presented in 3 different orientations "
-           "(center, left and right) for 3 different durations (0.5, 1.0 and 1.5s) one after another (interrupted by "
-           "blank screen). In the beginning of each block, participants were presented with 2 targets (a specific face "
-           "and object or letter and symbol) which they had to detect among the stimuli by pressing a button and remain"
-           "passive otherwise (target detection task). Stimuli of the same category as the targets are task relevant"
-           "and stimuli of a different category are task irrelevant. For the second task (T2), high and low pitch tone "
-           "were presented on every single trial at various SOA (0, 0.116, 0.232, 0.466) from visual stimuli onset or "
-           "offset of the visual stimuli which they had to discriminate between (2AFC).",
-    "auditory": "Participants were presented with high and low pitch sounds which participants had to discriminate "
-                "between through button press (2AFC). This task constituted a practice for the dual task experiment",
-    "visual": "visual stimuli of 4 different categories (faces, objects, letters and symbols) being presented in 3 "
-              "different orientations (center, left and right) for 3 different durations (0.5, 1.0 and 1.5s) one after "
-              "another (interrupted by blank screen). In the beginning of each block, participants were presented with "
-              "2 targets (a specific face and object or letter and symbol) which they had to detect among the stimuli "
-              "by pressing a button and remain passive otherwise (target detection task). This task constituted a "
-              "practice for the dual task experiment",
-    "introspection":
-        "Participants were presented with two conscecutive tasks. The first (T1) consisted of visual stimuli of "
-        "4 different categories (faces, objects, letters and symbols) being presented in 3 different orientations "
-        "(center, left and right) for 3 different durations (0.5, 1.0 and 1.5s) one after another (interrupted by "
-        "blank screen). In the beginning of each block, participants were presented with 2 targets (a specific face "
-        "and object or letter and symbol) which they had to detect among the stimuli by pressing a button and remain"
-        "passive otherwise (target detection task). Stimuli of the same category as the targets are task relevant"
-        "and stimuli of a different category are task irrelevant. For the second task (T2), high and low pitch tone "
-        "were presented on every single trial at various SOA (0, 0.116, 0.232, 0.466) from visual stimuli onset or "
-        "offset of the visual stimuli which they had to discriminate between (2AFC). At the end of each trial, "
-        "participants had to provide report of their introspection on how long it took them to decide to reach a "
-        "decision as to which button to press",
-}
@@ -0,0 +1,134 @@
+import os
+import gzip
+import zlib
+import struct
+import threading
+from .bids import imap_ordered, open_executor
+
+GZIP_EXTENSION = ".gz"
+# Number of bytes of the uncompressed file compressed into each gzip member:
+GZIP_BLOCK_BYTES = 2 ** 20
+# Identifier of the subfield of the gzip extra field holding the size of the member, so that the members can be
+# located without decompressing them (as bgzip does, but without its 64 kB limit on the member size):
+SIZE_SUBFIELD = b"BS"
+# Gzip member header with the FEXTRA flag and no mtime, followed by the extra field length and the size subfield:
+_HEADER = struct.Struct("<4sIBBH2sHI")
+_TRAILER = struct.Struct("<II")
+
+
+def is_gzip_file(file_name):
+    return str(file_name).endswith(GZIP_EXTENSION)
+
+
+def open_tsv(tsv_file, mode="rb"):
+    """
+    This function opens a tsv file, decompressing it on the fly if it is gzipped (.tsv.gz).
+    :param tsv_file: (path) tsv file to open
+    :param mode: (string) mode of open
+    :return: file object
+    """
+    if is_gzip_file(tsv_file):
+        return gzip.open(tsv_file, mode)
+    return open(tsv_file, mode)
+
+
+def compress_member(data, compresslevel=6):
+    """
+    This function compresses a block of bytes to a gzip member holding its own size in its extra field. The members
+    of a file can be concatenated: any gzip reader decompresses them as a single stream.
+    :param data: (bytes) block to compress
+    :param compresslevel: (int) gzip compression level, from 1 (fastest) to 9 (smallest)
+    :return: (bytes) the gzip member
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    member_size = _HEADER.size + len(deflated) + _TRAILER.size
+    header = _HEADER.pack(b"\x1f\x8b\x08\x04", 0, 0, 255, 8, SIZE_SUBFIELD, 4, member_size)
+    return header + deflated + _TRAILER.pack(zlib.crc32(data), len(data) & 0xffffffff)
+
+
+def _open_threads(n_threads):
+    # Compression runs on threads whatever the environment, as zlib releases the GIL:
+    return open_executor("serial" if n_threads == 1 else "threads", n_jobs=n_threads)
+
+
+def _split_blocks(data, block_size):
+    for start in range(0, len(data), block_size):
+        yield data[start:start + block_size]
+
+
+def write_gzip(file_name, blocks, compresslevel=6, n_threads=1):
+    """
+    This function writes a gzip file as a sequence of members, each compressing one block of the content, see
+    compress_member. With n_threads > 1, the blocks are compressed by a pool of threads, as zlib releases the GIL,
+    and written in order as they complete. The file is written to a temporary file that is then moved in place, and
+    the members hold no name nor time, so that compressing the same content always gives the same file.
+    :param file_name: (path) gzip file to write
+    :param blocks: (bytes or iterable of bytes) content of the file, or the successive blocks of the content for
+    content that is produced on the fly. Bytes are split into blocks of GZIP_BLOCK_BYTES
+    :param compresslevel: (int) see compress_member
+    :param n_threads: (int) number of threads compressing the blocks
+    :return: (int) size of the gzip file
+    """
+    if isinstance(blocks, (bytes, bytearray, memoryview)):
+        blocks = _split_blocks(blocks, GZIP_BLOCK_BYTES)
+    tmp_file = "{}.{}-{}.tmp".format(file_name, os.getpid(), threading.get_ident())
+    size = 0
+    try:
+        with open(tmp_file, 'wb') as fl, _open_threads(n_threads) as pool:
+            for member in imap_ordered(pool, compress_member, ((block, compresslevel) for block in blocks if block),
+                                       max_pending=2 * n_threads):
+                size += fl.write(member)
+            # Empty content still gives one (empty) member, as an empty file is not a valid gzip file:
+            if size == 0:
+                size += fl.write(compress_member(b"", compresslevel))
+        os.replace(tmp_file, file_name)
+    except BaseException:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return size
+
+
+def _find_members(data):
+    """
+    This function locates the members of a gzip file from the size subfield of their extra field.
+    :param data: (bytes) content of the gzip file
+    :return: (list of (int, int) or None) start and end of each member, None if any member has no size subfield,
+    i.e. if the file was not written by write_gzip
+    """
+    members, start = [], 0
+    while start < len(data):
+        if len(data) - start < _HEADER.size:
+            return None
+        magic, _, _, _, xlen, subfield, sublen, member_size = _HEADER.unpack_from(data, start)
+        # A size smaller than an empty member would not move to the next member:
+        if (magic != b"\x1f\x8b\x08\x04" or xlen != 8 or subfield != SIZE_SUBFIELD or sublen != 4
+                or member_size < _HEADER.size + _TRAILER.size):
+            return None
+        members.append((start, start + member_size))
+        start += member_size
+    return members
+
+
+def _decompress_member(data, start, end):
+    return zlib.decompress(data[start:end], wbits=16 + zlib.MAX_WBITS)
+
+
+def read_gzip(file_name, n_threads=1):
+    """
+    This function reads and decompresses a whole gzip file. The members of files written by write_gzip are
+    decompressed by a pool of threads with n_threads > 1, other gzip files are decompressed as a single stream.
+    :param file_name: (path) gzip file to read
+    :param n_threads: (int) number of threads decompressing the members
+    :return: (bytes) the decompressed content
+    """
+    with open(file_name, 'rb') as fl:
+        data = fl.read()
+    members = _find_members(data)
+    if members is None:
+        return gzip.decompress(data)
+    data = memoryview(data)
+    with _open_threads(n_threads) as pool:
+        return b"".join(imap_ordered(pool, _decompress_member, ((data, start, end) for start, end in members),
+                                     max_pending=2 * n_threads))
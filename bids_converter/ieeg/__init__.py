@@ -0,0 +1,3 @@
+from .convert_ieeg import (
+    ieeg_bids_conversion
+)
@@ -0,0 +1,171 @@
+import os
+import json
+import shutil
+from pathlib import Path
+import pandas as pd
+import mne
+from mne_bids import BIDSPath, write_raw_bids
+from ..bids import (imap_ordered, match_raw_files, open_executor, write_file_atomic, BIDSCONV_DIR)
+
+# Journal of the raw recordings already converted, within the bookkeeping directory of the bids root:
+IEEG_JOURNAL_FILE = "ieeg_conversion.json"
+# Folder of the bookkeeping directory in which each subject is converted before being moved to the bids root:
+IEEG_TMP_DIR = "ieeg_tmp"
+# Files of the bids root that mne_bids writes along with each recording, merged into the bids root by this key:
+_MERGED_TSV_KEYS = {"participants.tsv": "participant_id", "scans.tsv": "filename"}
+
+
+def _load_journal(bids_root):
+    try:
+        with open(Path(bids_root, BIDSCONV_DIR, IEEG_JOURNAL_FILE), 'r') as fl:
+            return json.load(fl)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_journal(bids_root, journal):
+    Path(bids_root, BIDSCONV_DIR).mkdir(parents=True, exist_ok=True)
+    write_file_atomic(Path(bids_root, BIDSCONV_DIR, IEEG_JOURNAL_FILE), json.dumps(journal, indent=2).encode())
+
+
+def _sources_stats(recordings):
+    stats = {}
+    for raw_file, _ in recordings:
+        stat = os.stat(raw_file)
+        stats[raw_file] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def convert_ieeg_subject(recordings, subject_root, ch_type="ecog", line_freq=None, write_kwargs=None):
+    """
+    This function converts the recordings of one subject to bids with mne_bids.write_raw_bids. The recordings are
+    converted one after the other and read without loading their data (preload=False), so that only one recording
+    is held in memory at a time. The subject is written to its own bids root, which is moved to the actual bids
+    root once complete, see _merge_subject: a subject is therefore never found half converted in the bids root.
+    :param recordings: (list of (string, dict)) raw file of each recording with its entities, see match_raw_files
+    :param subject_root: (path) bids root the subject is written to
+    :param ch_type: (string or None) type set to the channels that the raw file stores as eeg (such as the
+    BrainVision and EDF formats), e.g. "ecog" or "seeg". None leaves the channel types as they are read
+    :param line_freq: (float or None) power line frequency, if it is not stored in the raw files
+    :param write_kwargs: (dict or None) further arguments of write_raw_bids
+    :return: (list of strings) the bids file of each recording
+    """
+    if os.path.isdir(subject_root):
+        # Left over by an interrupted conversion:
+        shutil.rmtree(subject_root)
+    bids_files = []
+    for raw_file, entities in recordings:
+        raw = mne.io.read_raw(raw_file, preload=False, verbose=False)
+        if ch_type is not None:
+            raw.set_channel_types({ch: ch_type for ch, ch_t in zip(raw.ch_names, raw.get_channel_types())
+                                   if ch_t == "eeg"}, verbose=False)
+        if line_freq is not None:
+            raw.info["line_freq"] = line_freq
+        bids_path = BIDSPath(subject=entities["subject"], session=entities.get("session"), task=entities["task"],
+                             acquisition=entities.get("acquisition"), run=entities.get("run"), datatype="ieeg",
+                             root=subject_root)
+        write_raw_bids(raw, bids_path, overwrite=True, verbose=False, **(write_kwargs or {}))
+        bids_files.append(str(bids_path.fpath))
+        del raw
+    return bids_files
+
+
+def _merge_tsv(tsv_file, target_file, key):
+    """
+    This function merges the rows of a tsv file into another one, the rows of tsv_file replacing those of
+    target_file with the same key.
+    """
+    table = pd.read_csv(tsv_file, sep="\t", dtype=str, keep_default_na=False)
+    if os.path.isfile(target_file):
+        table = pd.concat([pd.read_csv(target_file, sep="\t", dtype=str, keep_default_na=False), table],
+                          ignore_index=True).drop_duplicates(subset=key, keep="last")
+    write_file_atomic(target_file, table.to_csv(sep="\t", index=False, na_rep="n/a").encode())
+
+
+def _merge_subject(subject_root, bids_root):
+    """
+    This function moves a subject converted to its own bids root into the bids root. The files of the subject are
+    moved in place, the participants and scans tsv are merged into the existing ones and the other dataset files
+    written by mne_bids (dataset_description.json, README...) are only moved if the bids root does not have them yet.
+    :param subject_root: (path) bids root the subject was written to
+    :param bids_root: (path) bids root directory
+    :return:
+    """
+    for dirpath, _, filenames in os.walk(subject_root):
+        rel_dir = os.path.relpath(dirpath, subject_root)
+        for filename in filenames:
+            source, target = Path(dirpath, filename), Path(bids_root, rel_dir, filename)
+            merge_key = _MERGED_TSV_KEYS.get(filename if rel_dir == "." else filename.split("_")[-1])
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if merge_key is not None:
+                _merge_tsv(source, target, merge_key)
+            elif rel_dir != "." or not target.exists():
+                os.replace(source, target)
+    shutil.rmtree(subject_root)
+
+
+def ieeg_bids_conversion(raw_root, bids_root, pattern, subjects=None, task=None, ch_type="ecog", line_freq=None,
+                         n_jobs=1, executor=None, verbose=True, overwrite=False, write_kwargs=None):
+    """
+    This function converts the iEEG recordings of a data set to bids with mne_bids. The raw recordings are found
+    with a filename pattern (e.g. "{subject}/{subject}_{task}_run{run}.vhdr", see compile_filename_pattern) and
+    each subject is converted by a worker of a pool of processes (see convert_ieeg_subject), holding one recording
+    in memory at a time. Once a subject is converted, it is moved to the bids root and its raw files are recorded
+    in a journal (bids_root/.bidsconv/ieeg_conversion.json) along with their size and mtime. The conversion can
+    therefore be resumed after a crash: the subjects whose raw files are all in the journal, unchanged, are skipped.
+    The subjects are converted in parallel rather than the runs, as the runs of a subject share its scans.tsv.
+    :param raw_root: (path) root directory of the raw recordings
+    :param bids_root: (path) bids root directory
+    :param pattern: (string) pattern of the raw recordings paths relative to raw_root. For formats spread over several
+    files, it must only match the file read by mne (e.g. the .vhdr file of BrainVision recordings)
+    :param subjects: (list of strings or None) labels of the subjects to convert, e.g.
+    environment_variables.subjects_lists_ecog["dur"]. All the subjects found by default
+    :param task: (string or None) task to convert. All the tasks found by default
+    :param ch_type: (string or None) see convert_ieeg_subject
+    :param line_freq: (float or None) see convert_ieeg_subject
+    :param n_jobs: (int) number of subjects converted in parallel
+    :param executor: (string, Executor or None) see open_executor. Defaults to processes when n_jobs > 1
+    :param verbose: (boolean)
+    :param overwrite: (boolean) whether to convert again the subjects found in the journal
+    :param write_kwargs: (dict or None) further arguments of write_raw_bids
+    :return: journal: (dict) the size and mtime of each converted raw file
+    """
+    subjects_recordings = {}
+    for raw_file, entities in match_raw_files(raw_root, pattern):
+        if (subjects is None or entities["subject"] in subjects) and (task is None or entities["task"] == task):
+            subjects_recordings.setdefault(entities["subject"], []).append((raw_file, entities))
+    if subjects is not None:
+        for subject in subjects:
+            if subject not in subjects_recordings and verbose:
+                print("=" * 40)
+                print("WARNING: No recording found for the subject {}".format(subject))
+    journal = {} if overwrite else _load_journal(bids_root)
+    to_convert = []
+    for subject, recordings in subjects_recordings.items():
+        if all(journal.get(raw_file) == stats for raw_file, stats in _sources_stats(recordings).items()):
+            if verbose:
+                print("=" * 40)
+                print("The subject {} is already converted".format(subject))
+            continue
+        to_convert.append(subject)
+
+    tmp_root = Path(bids_root, BIDSCONV_DIR, IEEG_TMP_DIR)
+    args_list = ((subjects_recordings[subject], str(Path(tmp_root, subject)), ch_type, line_freq, write_kwargs)
+                 for subject in to_convert)
+    with open_executor(executor, n_jobs=n_jobs, default="processes") as pool:
+        # A single subject per worker is submitted at once, so that only n_jobs recordings are loaded:
+        for subject, bids_files in zip(to_convert, imap_ordered(pool, convert_ieeg_subject, args_list,
+                                                                max_pending=n_jobs)):
+            _merge_subject(Path(tmp_root, subject), bids_root)
+            journal.update(_sources_stats(subjects_recordings[subject]))
+            _save_journal(bids_root, journal)
+            if verbose:
+                print("=" * 40)
+                print("Converted the subject {}: {} recordings".format(subject, len(bids_files)))
+    return journal
+
+
+if __name__ == "__main__":
+    from ..example_var import ev
+    ieeg_bids_conversion(ev.raw_root, ev.bids_root, "{subject}/{subject}_{task}_run{run}.edf",
+                         subjects=ev.subjects_lists_ecog["dur"], task="dur", n_jobs=4, verbose=True)
@@ -0,0 +1,278 @@
+import io
+import mmap
+import warnings
+import numpy as np
+import pandas as pd
+from .gzip_tsv import is_gzip_file, open_tsv
+
+TAB, NEWLINE, CARRIAGE_RETURN, QUOTE = ord("\t"), ord("\n"), ord("\r"), ord('"')
+# Number of bytes of the file scanned at once, the rows of a segment being located and extracted together:
+SCAN_BLOCK_BYTES = 16 * 2 ** 20
+# Number of bytes decompressed at once from a gzipped file:
+STREAM_READ_BYTES = 2 ** 20
+# Maximal size of the fields extracted for a block: the blocks of a file holding wide fields hold fewer rows, as
+# every field of a column takes the width of the widest one:
+BLOCK_FIELDS_BYTES = 4 * 2 ** 20
+# Number of bytes of fields gathered at once, as the gather needs 8 bytes of index per byte:
+GATHER_BYTES = 2 ** 18
+
+
+class _ResumedStream(io.RawIOBase):
+    """
+    This class reads some bytes already read from a stream, followed by the rest of the stream, so that a reader can
+    take over a stream from a position that was already consumed.
+    """
+
+    def __init__(self, head, stream):
+        self._head, self._stream = memoryview(head), stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if len(self._head) > 0:
+            n_bytes = min(len(buffer), len(self._head))
+            buffer[:n_bytes] = self._head[:n_bytes]
+            self._head = self._head[n_bytes:]
+            return n_bytes
+        return self._stream.readinto(buffer)
+
+
+class MappedTSV:
+    """
+    This class reads the columns of a tsv file with a memory footprint that does not depend on the size of the file.
+    The file is memory mapped and scanned in segments of SCAN_BLOCK_BYTES: the rows and fields boundaries of each
+    segment are found with vectorized scans of the mapped bytes and the requested columns are extracted in blocks of
+    block_rows rows, as numpy arrays of bytes strings (see iter_blocks). Gzipped files (.tsv.gz) cannot be mapped:
+    they are decompressed as a stream, one segment at a time. From the first block that the scan cannot handle,
+    i.e. holding quotes or rows with a different number of fields than the header, the rest of the file is read by
+    pandas instead, in chunks of block_rows rows, so that they give the same columns.
+    Use it as a context manager, so that the file is unmapped once done:
+        with MappedTSV(events_file) as tsv:
+            for block in tsv.iter_blocks(["RT_vis"]):
+                rts = block["RT_vis"]
+    """
+
+    def __init__(self, tsv_file, block_rows=65536):
+        """
+        :param tsv_file: (path) tsv file to read
+        :param block_rows: (int) number of rows whose fields are extracted at once
+        """
+        self.tsv_file = tsv_file
+        self.block_rows = block_rows
+        self._mmap = None
+        self._compressed = is_gzip_file(tsv_file)
+        if self._compressed:
+            with open_tsv(tsv_file, 'rb') as fl:
+                header = fl.readline()
+            self._data_start = len(header)
+        else:
+            with open(tsv_file, 'rb') as fl:
+                size = fl.seek(0, 2)
+                if size > 0:
+                    self._mmap = mmap.mmap(fl.fileno(), 0, access=mmap.ACCESS_READ)
+            header_end = self._mmap.find(b"\n") if self._mmap is not None else -1
+            header_end = size if header_end == -1 else header_end + 1
+            header = self._mmap[:header_end] if self._mmap is not None else b""
+            self._data_start = header_end
+        self.columns = header.decode("utf-8-sig").rstrip("\r\n").split("\t") if header.strip() else []
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __getitem__(self, column):
+        return self.read_columns([column])[column]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _mapped_segments(self):
+        """
+        This function cuts the mapped file into segments of whole rows.
+        :return: (generator of (numpy array, callable)) the bytes of each segment, without copy, with a function
+        opening the file at an offset of the segment
+        """
+        size = len(self._mmap)
+        start = self._data_start
+        while start < size:
+            end = min(start + SCAN_BLOCK_BYTES, size)
+            if end < size:
+                last_newline = self._mmap.rfind(b"\n", start, end)
+                # A row longer than a segment is kept whole:
+                end = last_newline + 1 if last_newline != -1 else self._mmap.find(b"\n", end) + 1 or size
+
+            def resume(offset, segment_start=start):
+                fl = open(self.tsv_file, 'rb')
+                fl.seek(segment_start + offset)
+                return fl
+            yield np.frombuffer(self._mmap, dtype=np.uint8, count=end - start, offset=start), resume
+            start = end
+
+    def _streamed_segments(self):
+        """
+        This function decompresses a gzipped file one segment of whole rows at a time. The segments are decompressed
+        in reads of STREAM_READ_BYTES into a single buffer, reused from one segment to the next, so that no other
+        copy of a segment is made.
+        :return: (generator of (numpy array, callable)) see _mapped_segments
+        """
+        with open_tsv(self.tsv_file, 'rb') as fl:
+            fl.readline()
+            buffer = bytearray(SCAN_BLOCK_BYTES)
+            filled, eof = 0, False
+            while not eof:
+                with memoryview(buffer) as view:
+                    while filled < len(buffer):
+                        n_read = fl.readinto(view[filled:filled + STREAM_READ_BYTES])
+                        if n_read == 0:
+                            eof = True
+                            break
+                        filled += n_read
+                end = filled if eof else buffer.rfind(b"\n", 0, filled) + 1
+                # A row longer than a segment is kept whole:
+                if end == 0 and not eof:
+                    buffer = buffer + bytearray(SCAN_BLOCK_BYTES)
+                    continue
+                if end > 0:
+                    def resume(offset, data=buffer, size=filled):
+                        return io.BufferedReader(_ResumedStream(bytes(data[offset:size]), fl))
+                    yield np.frombuffer(buffer, dtype=np.uint8, count=end), resume
+                # The start of the next row is moved to the front of the buffer:
+                remainder = buffer[end:filled]
+                buffer[:len(remainder)] = remainder
+                filled = len(remainder)
+
+    @staticmethod
+    def _find_rows(segment):
+        """
+        This function finds the start and end of each row of a segment, skipping the blank lines as pandas does.
+        :param segment: (numpy array) bytes of whole rows
+        :return: row_starts, row_ends: (numpy arrays) offsets of the first byte of each row and of the byte after it
+        """
+        row_ends = np.flatnonzero(segment == NEWLINE)
+        row_starts = np.concatenate([[0], row_ends + 1]).astype(np.int64)
+        row_ends = np.concatenate([row_ends, [len(segment)]]).astype(np.int64)
+        # Windows line endings:
+        has_cr = row_ends > row_starts
+        has_cr[has_cr] = segment[row_ends[has_cr] - 1] == CARRIAGE_RETURN
+        row_ends -= has_cr
+        not_blank = row_ends > row_starts
+        return row_starts[not_blank], row_ends[not_blank]
+
+    @staticmethod
+    def _fields(segment, positions, lengths):
+        """
+        This function gathers fields of a segment into a fixed width array of bytes strings. The fields are gathered
+        GATHER_BYTES at a time, so that the index of the gather does not depend on the number of fields.
+        :param segment: (numpy array) bytes of whole rows
+        :param positions: (numpy array) offset of each field
+        :param lengths: (numpy array) length of each field
+        :return: (numpy array of bytes strings)
+        """
+        width = max(int(lengths.max()), 1) if len(lengths) else 1
+        offsets = np.arange(width)
+        fields = np.zeros((len(positions), width), dtype=np.uint8)
+        step = max(GATHER_BYTES // width, 1)
+        for start in range(0, len(positions), step):
+            index = np.minimum(positions[start:start + step, None] + offsets, len(segment) - 1)
+            # Bytes past the end of each field are set to 0, which numpy strips from bytes strings:
+            fields[start:start + step] = np.where(offsets < lengths[start:start + step, None], segment[index], 0)
+        return fields.view("S{}".format(width)).ravel()
+
+    def _scan_segment(self, segment, indices):
+        """
+        This function extracts the columns of a segment, block_rows rows at a time. Each block is extracted once the
+        previous one was consumed, so that only one block is held in memory. The blocks are checked one by one: from
+        the first one holding quotes or rows with a different number of fields than the header, the segment cannot
+        be scanned.
+        :param segment: (numpy array) bytes of whole rows
+        :param indices: (dict) column name -> index of the column
+        :return: (generator of dicts) the columns of each block, see iter_blocks. The generator returns None if the
+        whole segment was scanned, or the offset of the first row that could not be
+        """
+        all_starts, all_ends = self._find_rows(segment)
+        n_tabs = len(self.columns) - 1
+        for start in range(0, len(all_starts), self.block_rows):
+            row_starts = all_starts[start:start + self.block_rows]
+            row_ends = all_ends[start:start + self.block_rows]
+            if np.any(segment[row_starts[0]:row_ends[-1]] == QUOTE):
+                return int(row_starts[0])
+            tabs = np.flatnonzero(segment[row_starts[0]:row_ends[-1]] == TAB) + row_starts[0]
+            # The tabs after the end of each row, to check that every row has as many fields as the header:
+            tabs_per_row = np.diff(np.searchsorted(tabs, np.concatenate([[row_starts[0]], row_ends])))
+            if np.any(tabs_per_row != n_tabs):
+                return int(row_starts[0])
+            tabs = tabs.reshape(len(row_starts), n_tabs)
+            fields = {}
+            for column, index in indices.items():
+                field_starts = row_starts if index == 0 else tabs[:, index - 1] + 1
+                field_ends = row_ends if index == n_tabs else tabs[:, index]
+                fields[column] = field_starts, field_ends - field_starts
+            # Wide fields cut the block into smaller ones, so that the fields of a block fit in BLOCK_FIELDS_BYTES:
+            width = sum(int(lengths.max()) for _, lengths in fields.values())
+            step = max(BLOCK_FIELDS_BYTES // max(width, 1), 1)
+            for sub_start in range(0, len(row_starts), step):
+                yield {column: self._fields(segment, starts[sub_start:sub_start + step],
+                                            lengths[sub_start:sub_start + step])
+                       for column, (starts, lengths) in fields.items()}
+        return None
+
+    def _read_with_pandas(self, stream, columns):
+        """
+        This function reads the rest of the file with pandas, in chunks of block_rows rows.
+        :param stream: (binary file object) file positioned at the start of a row
+        :param columns: (list of strings) names of the columns to extract
+        :return: (generator of dicts) see iter_blocks
+        """
+        with stream, warnings.catch_warnings():
+            # Rows longer than the header are cut to the header, as the scan does not accept them either:
+            warnings.simplefilter("ignore", pd.errors.ParserWarning)
+            # index_col=False, so that rows with more fields than the header do not turn the first column into
+            # the index:
+            for chunk in pd.read_csv(stream, sep="\t", header=None, names=self.columns, usecols=columns, dtype=str,
+                                     keep_default_na=False, index_col=False, encoding="utf-8",
+                                     chunksize=self.block_rows):
+                chunk = chunk.fillna("")
+                yield {column: np.char.encode(chunk[column].to_numpy(dtype=str), "utf-8") for column in columns}
+
+    def iter_blocks(self, columns):
+        """
+        This function extracts some of the columns of the file, block_rows rows at a time, so that only one block of
+        each column is held in memory.
+        :param columns: (list of strings) names of the columns to extract
+        :return: (generator of dicts) for each block, column name -> numpy array of bytes strings, one per row
+        """
+        for column in columns:
+            assert column in self.columns, "The column {} is not in {}!".format(column, self.tsv_file)
+        if not self.columns:
+            return
+        indices = {column: self.columns.index(column) for column in columns}
+        segments = self._streamed_segments() if self._compressed else self._mapped_segments()
+        for segment, resume in segments:
+            offset = yield from self._scan_segment(segment, indices)
+            if offset is not None:
+                yield from self._read_with_pandas(resume(offset), columns)
+                return
+
+    def read_columns(self, columns):
+        """
+        This function extracts some of the columns of the whole file, see iter_blocks.
+        :param columns: (list of strings) names of the columns to extract
+        :return: (dict) column name -> numpy array of bytes strings, one per row
+        """
+        blocks = {column: [] for column in columns}
+        for block in self.iter_blocks(columns):
+            for column in columns:
+                blocks[column].append(block[column])
+        return {column: np.concatenate(blocks[column]) if blocks[column] else np.zeros(0, "S1")
+                for column in columns}
+
+    def __len__(self):
+        return len(self.read_columns(self.columns[:1])[self.columns[0]]) if self.columns else 0
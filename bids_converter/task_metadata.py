@@ -0,0 +1,325 @@
+import os
+import json
+import hashlib
+import marshal
+from collections.abc import Mapping
+from pathlib import Path
+from .bids import write_file_atomic
+
+# Extensions of the task metadata files, one file per task named <task>.json or <task>.toml:
+TASK_METADATA_EXTENSIONS = [".json", ".toml"]
+# Folder next to the task metadata files holding their compiled (marshalled) version:
+TASK_METADATA_CACHE_DIR = "__pycache__"
+# Version of the compiled task metadata, to increase whenever the validation or the normalization of the metadata
+# changes, so that the files compiled by former versions are compiled again:
+TASK_METADATA_CACHE_VERSION = 2
+# File of a task metadata directory holding the column descriptions shared by several tasks. Files starting with
+# an underscore are not tasks:
+COLUMN_FRAGMENTS_FILE = "_columns"
+# Key of a column description referring to a shared column description:
+FRAGMENT_REF_KEY = "$ref"
+# Task metadata files loaded by this process, with the mtime and size of the file they were loaded from:
+_loaded_task_files = {}
+# Resolved column descriptions, keyed by their serialization, so that identical descriptions are a single object:
+_interned_columns = {}
+
+
+def _read_task_file(task_file):
+    if Path(task_file).suffix == ".toml":
+        # tomllib is part of the standard library from python 3.11 on:
+        import tomllib
+        with open(task_file, 'rb') as fl:
+            return tomllib.load(fl)
+    with open(task_file, 'r', encoding="utf-8") as fl:
+        return json.load(fl)
+
+
+def _validate_column(col, col_dict, task_file, allow_ref=True):
+    """
+    This function checks the description of a column and normalizes its levels to a dictionary with string keys, as
+    they are written in the events files and the sidecars.
+    :param col: (string) name of the column
+    :param col_dict: (dict) description of the column
+    :param task_file: (path) file the description was read from, for the error messages
+    :param allow_ref: (boolean) whether the description may refer to a shared column description
+    :return: (dict) the normalized description
+    """
+    assert isinstance(col_dict, dict), "The description of the column {} in {} must be a dictionary!".format(
+        col, task_file)
+    for key in ["LongName", "Description", "Units"]:
+        assert isinstance(col_dict.get(key, ""), str), "The {} of the column {} in {} must be a string!".format(
+            key, col, task_file)
+    if FRAGMENT_REF_KEY in col_dict:
+        assert allow_ref, "The column {} in {} cannot refer to another column!".format(col, task_file)
+        assert isinstance(col_dict[FRAGMENT_REF_KEY], str), "The {} of the column {} in {} must be a string!".format(
+            FRAGMENT_REF_KEY, col, task_file)
+    col_dict = dict(col_dict)
+    if "Levels" in col_dict:
+        levels = col_dict["Levels"]
+        assert isinstance(levels, (dict, list)), \
+            "The Levels of the column {} in {} must be a dictionary or a list!".format(col, task_file)
+        if isinstance(levels, list):
+            levels = {level: "" for level in levels}
+        col_dict["Levels"] = {str(level): level_desc for level, level_desc in levels.items()}
+    return col_dict
+
+
+def validate_task_metadata(metadata, task_file=""):
+    """
+    This function checks the structure of the metadata of a task and normalizes the description of its columns, see
+    _validate_column. A column may refer to a shared column description with {"$ref": <name>}, see
+    resolve_columns.
+    :param metadata: (dict) metadata of a task, with the task description under "description" and the description
+    of the columns of its events files under "columns"
+    :param task_file: (path) file the metadata was read from, for the error messages
+    :return: (dict) the normalized metadata
+    """
+    assert isinstance(metadata, dict), "The task file {} must hold a dictionary!".format(task_file)
+    assert isinstance(metadata.get("description"), str), \
+        "The task file {} must hold the task description as a string under description!".format(task_file)
+    assert isinstance(metadata.get("columns"), dict), \
+        "The task file {} must hold the columns descriptions as a dictionary under columns!".format(task_file)
+    columns = {col: _validate_column(col, col_dict, task_file) for col, col_dict in metadata["columns"].items()}
+    return {**metadata, "columns": columns}
+
+
+def validate_column_fragments(fragments, fragments_file=""):
+    """
+    This function checks the shared column descriptions of a task metadata directory, see validate_task_metadata.
+    :param fragments: (dict) name -> column description
+    :param fragments_file: (path) file the descriptions were read from, for the error messages
+    :return: (dict) the normalized descriptions
+    """
+    assert isinstance(fragments, dict), "The file {} must hold a dictionary!".format(fragments_file)
+    return {name: _validate_column(name, col_dict, fragments_file, allow_ref=False)
+            for name, col_dict in fragments.items()}
+
+
+def intern_column(col_dict):
+    """
+    This function returns the single instance of a column description: identical descriptions (same keys in the
+    same order and same values) are the same object, so that a description shared by many tasks is held and
+    serialized once.
+    :param col_dict: (dict) description of a column
+    :return: (dict) the interned description, which must not be modified
+    """
+    return _interned_columns.setdefault(json.dumps(col_dict), col_dict)
+
+
+def resolve_columns(columns, fragments, task_file=""):
+    """
+    This function resolves the references of the columns of a task to the shared column descriptions: a column
+    described as {"$ref": <name>, ...} gets the shared description <name>, updated with the other keys of the
+    column, which take precedence (e.g. a task specific Description). All the descriptions are interned, see
+    intern_column.
+    :param columns: (dict) description of each column of a task
+    :param fragments: (dict) shared column descriptions
+    :param task_file: (path) file the columns were read from, for the error messages
+    :return: (dict) the resolved description of each column
+    """
+    resolved = {}
+    for col, col_dict in columns.items():
+        if FRAGMENT_REF_KEY in col_dict:
+            ref = col_dict[FRAGMENT_REF_KEY]
+            assert ref in fragments, "The column {} in {} refers to the undefined column description {}!".format(
+                col, task_file, ref)
+            col_dict = {**fragments[ref], **{key: val for key, val in col_dict.items() if key != FRAGMENT_REF_KEY}}
+        resolved[col] = intern_column(col_dict)
+    return resolved
+
+
+def load_task_file(task_file, validate=validate_task_metadata):
+    """
+    This function loads the metadata of a task from its json or toml file and validates it. Parsing and validating
+    the file is only done once: the result is saved with marshal in a __pycache__ folder next to it, which is
+    reused as long as the content of the file is the same (the cache is keyed on a hash of the content, so that it
+    survives a fresh checkout), as is the function compiling it: TASK_METADATA_CACHE_VERSION and the validation
+    function are part of the key. Within a process, the metadata is only loaded again if the mtime or size of the
+    file changed. The metadata only holds plain json types, which marshal stores without running any code when
+    loaded, unlike pickle: a cache folder shared with other users cannot make the converter run their code.
+    :param task_file: (path) json or toml file holding the metadata of a task
+    :param validate: (function) function checking and normalizing the content of the file, validate_task_metadata
+    for the task files and validate_column_fragments for the shared column descriptions
+    :return: (dict) the metadata of the task
+    """
+    task_file = str(task_file)
+    stat = os.stat(task_file)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    if task_file in _loaded_task_files and _loaded_task_files[task_file][0] == stat_key:
+        return _loaded_task_files[task_file][1]
+    with open(task_file, 'rb') as fl:
+        content_hash = hashlib.sha256(fl.read()).hexdigest()
+    cache_key = (TASK_METADATA_CACHE_VERSION, "{}.{}".format(validate.__module__, validate.__qualname__),
+                 content_hash)
+    cache_file = Path(os.path.dirname(task_file), TASK_METADATA_CACHE_DIR, os.path.basename(task_file) + ".marshal")
+    metadata = None
+    try:
+        with open(cache_file, 'rb') as fl:
+            cached_key, cache_metadata = marshal.load(fl)
+        if cached_key == cache_key:
+            metadata = cache_metadata
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    if metadata is None:
+        metadata = validate(_read_task_file(task_file), task_file)
+        try:
+            cache_file.parent.mkdir(exist_ok=True)
+            write_file_atomic(cache_file, marshal.dumps((cache_key, metadata)))
+        except OSError:
+            # Read only installations simply parse the file every time:
+            pass
+    _loaded_task_files[task_file] = (stat_key, metadata)
+    return metadata
+
+
+class TaskRegistry(Mapping):
+    """
+    This class maps each task to its metadata, stored in a directory with one <task>.json or <task>.toml file per
+    task holding the description of the task ("description") and of the columns of its events files ("columns").
+    The files are loaded lazily: listing the tasks only lists the directory and the file of a task is only loaded
+    (see load_task_file) when the task is accessed, so that a conversion only loads the tasks of its data set.
+    Adding a study or a task is adding files, not code. Column descriptions shared by several tasks are written
+    once in the _columns.json (or .toml) file of the directory and referred to from the tasks, see resolve_columns.
+    The registry can be passed to beh_bids_metadata and create_beh_events_sidecar in place of the task_description
+    and events_col_description dictionaries.
+    """
+
+    def __init__(self, metadata_dir):
+        """
+        :param metadata_dir: (path) directory holding one <task>.json or <task>.toml file per task
+        """
+        self.metadata_dir = metadata_dir
+        self._task_files = None
+        self._fragments_file = None
+        self._resolved = {}
+
+    def _list_files(self):
+        self._task_files = {}
+        for entry in sorted(os.scandir(self.metadata_dir), key=lambda entry: entry.name):
+            task, ext = os.path.splitext(entry.name)
+            if ext not in TASK_METADATA_EXTENSIONS or not entry.is_file():
+                continue
+            if task == COLUMN_FRAGMENTS_FILE:
+                self._fragments_file = entry.path
+            elif not task.startswith("_"):
+                assert task not in self._task_files, "The task {} has several metadata files in {}!".format(
+                    task, self.metadata_dir)
+                self._task_files[task] = entry.path
+
+    @property
+    def task_files(self):
+        if self._task_files is None:
+            self._list_files()
+        return self._task_files
+
+    @property
+    def fragments(self):
+        # The shared column descriptions are only loaded once a task refers to them:
+        if self._task_files is None:
+            self._list_files()
+        if self._fragments_file is None:
+            return {}
+        return load_task_file(self._fragments_file, validate=validate_column_fragments)
+
+    @property
+    def descriptions(self):
+        return TaskMetadata(self, "description")
+
+    @property
+    def columns(self):
+        return TaskMetadata(self, "columns")
+
+    def validate(self):
+        """
+        This function loads and validates the files of all the tasks, e.g. to check a registry before using it.
+        :return:
+        """
+        for task in self:
+            self[task]
+
+    def __getitem__(self, task):
+        metadata = load_task_file(self.task_files[task])
+        fragments = None
+        if any(FRAGMENT_REF_KEY in col_dict for col_dict in metadata["columns"].values()):
+            fragments = self.fragments
+        # The task is only resolved again if its file or the shared descriptions were loaded again:
+        if task in self._resolved and self._resolved[task][0] is metadata and self._resolved[task][1] is fragments:
+            return self._resolved[task][2]
+        resolved = {**metadata, "columns": resolve_columns(metadata["columns"], fragments or {},
+                                                           self.task_files[task])}
+        self._resolved[task] = (metadata, fragments, resolved)
+        return resolved
+
+    def __contains__(self, task):
+        return task in self.task_files
+
+    def __iter__(self):
+        return iter(self.task_files)
+
+    def __len__(self):
+        return len(self.task_files)
+
+    def __repr__(self):
+        return "TaskRegistry({!r})".format(str(self.metadata_dir))
+
+
+class TaskMetadata(Mapping):
+    """
+    This class maps each task of a TaskRegistry to one field of its metadata (e.g. its description or the
+    description of the columns of its events files), loading the tasks lazily. It can be passed wherever the
+    task_description and events_col_description dictionaries are expected.
+    """
+
+    def __init__(self, registry, field):
+        """
+        :param registry: (TaskRegistry) the tasks metadata
+        :param field: (string) field of the task metadata to map the tasks to
+        """
+        self.registry = registry
+        self.field = field
+
+    def __getitem__(self, task):
+        return self.registry[task][self.field]
+
+    def __contains__(self, task):
+        return task in self.registry
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
+
+    def __repr__(self):
+        return "TaskMetadata({!r}, {!r})".format(self.registry, self.field)
+
+
+def load_tasks_metadata(metadata_dir):
+    """
+    This function gives lazy access to the metadata of the tasks stored in a directory, see TaskRegistry.
+    :param metadata_dir: (path) directory holding the task files
+    :return: tasks_descriptions, logs_column_descriptions: (TaskMetadata) the task descriptions and column
+    descriptions expected by beh_bids_metadata
+    """
+    registry = TaskRegistry(metadata_dir)
+    return registry.descriptions, registry.columns
+
+
+def resolve_tasks_metadata(task_description, events_col_description=None):
+    """
+    This function turns the tasks metadata passed to the conversion functions into the task_description and
+    events_col_description mappings: a directory of task files or a TaskRegistry are split into their two views,
+    dictionaries are passed through.
+    :param task_description: (dict, TaskRegistry or path) the task descriptions, or the registry of all the tasks
+    metadata
+    :param events_col_description: (dict or None) the columns descriptions, None if task_description is a registry
+    :return: task_description, events_col_description: (mappings)
+    """
+    if isinstance(task_description, (str, os.PathLike)):
+        task_description = TaskRegistry(task_description)
+    if isinstance(task_description, TaskRegistry):
+        assert events_col_description is None, ("The columns descriptions are part of the task registry and cannot be "
+                                                "passed separately!")
+        return task_description.descriptions, task_description.columns
+    assert events_col_description is not None, "The columns descriptions are missing!"
+    return task_description, events_col_description
@@ -0,0 +1,59 @@
+import gzip
+import json
+from pathlib import Path
+import pytest
+from bids_converter.et import et_bids_conversion
+
+PATTERN = "{subject}/{subject}_{task}_run{run}_samples.tsv"
+COLUMNS = {"time": "timestamp", "gx": "x_coordinate", "gy": "y_coordinate"}
+
+
+def _write_samples(raw_root, subject, rows):
+    (raw_root / subject).mkdir(parents=True, exist_ok=True)
+    lines = ["time\tgx\tgy\textra"] + ["\t".join(row) for row in rows]
+    (raw_root / subject / "{}_prp_run1_samples.tsv".format(subject)).write_text("\n".join(lines) + "\n")
+
+
+def _physio_file(bids_root, subject):
+    return bids_root / "sub-{}".format(subject) / "beh" / "sub-{}_task-prp_run-1_recording-eye1_physio.tsv.gz".format(
+        subject)
+
+
+def test_conversion(tmp_path):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    _write_samples(raw_root, "SX101", [("1500", "960.5", "."), ("1502", "961", "540"), ("1504", ".", "541.25")])
+    physio_files = et_bids_conversion(raw_root, bids_root, PATTERN, COLUMNS, na_values=["."], start_timestamp=1000,
+                                      chunksize=2, verbose=False)
+    assert physio_files == [_physio_file(bids_root, "SX101")]
+    with gzip.open(physio_files[0], "rt") as fl:
+        assert fl.read() == "1500\t960.5\tn/a\n1502\t961\t540\n1504\tn/a\t541.25\n"
+    with open(str(physio_files[0]).replace(".tsv.gz", ".json")) as fl:
+        sidecar = json.load(fl)
+    assert sidecar["SamplingFrequency"] == 500 and sidecar["StartTime"] == 0.5
+    assert sidecar["Columns"] == ["timestamp", "x_coordinate", "y_coordinate"]
+
+
+def test_start_time(tmp_path):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    _write_samples(raw_root, "SX101", [("1500", "960", "540"), ("1502", "961", "540")])
+    with pytest.raises(AssertionError):
+        et_bids_conversion(raw_root, bids_root, PATTERN, COLUMNS, verbose=False)
+    et_bids_conversion(raw_root, bids_root, PATTERN, COLUMNS, start_timestamp={"SX101_prp_run1_samples.tsv": 1250},
+                       verbose=False)
+    with open(str(_physio_file(bids_root, "SX101")).replace(".tsv.gz", ".json")) as fl:
+        assert json.load(fl)["StartTime"] == 0.25
+    et_bids_conversion(raw_root, bids_root, PATTERN, COLUMNS, sidecar_metadata={"StartTime": 2}, verbose=False,
+                       overwrite=True)
+    with open(str(_physio_file(bids_root, "SX101")).replace(".tsv.gz", ".json")) as fl:
+        assert json.load(fl)["StartTime"] == 2
+
+
+def test_header_only_file_is_skipped(tmp_path, capsys):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    _write_samples(raw_root, "SX101", [])
+    _write_samples(raw_root, "SX102", [("0", "960", "540"), ("2", "961", "540")])
+    physio_files = et_bids_conversion(raw_root, bids_root, PATTERN, COLUMNS, start_timestamp=0)
+    assert physio_files == [_physio_file(bids_root, "SX102")]
+    assert not _physio_file(bids_root, "SX101").exists()
+    assert not Path(str(_physio_file(bids_root, "SX101")).replace(".tsv.gz", ".json")).exists()
+    assert "holds no samples" in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+from bids_converter import task_metadata
+from bids_converter.task_metadata import TaskRegistry
+from bids_converter.beh.events_schema import _file_columns_stats, merge_events_schema
+
+
+def test_levels_are_the_raw_values(tmp_path):
+    events_file = tmp_path / "sub-01_task-prp_events.tsv"
+    events_file.write_text("cond\trt\tresp\n1\t0.5\tleft\nn/a\t1.25\t\n2\tn/a\tright\n")
+    stats = _file_columns_stats(events_file, max_levels=20, verbose=False)
+    assert stats["cond"]["levels"] == {"1", "2"}
+    assert stats["cond"]["numeric"] and (stats["cond"]["minimum"], stats["cond"]["maximum"]) == (1, 2)
+    assert (stats["rt"]["minimum"], stats["rt"]["maximum"]) == (0.5, 1.25)
+    assert not stats["resp"]["numeric"] and stats["resp"]["levels"] == {"left", "right"}
+
+
+def test_merge_only_loads_the_tasks_of_the_data(tmp_path, monkeypatch):
+    for task in ["prp", "auditory", "visual"]:
+        (tmp_path / "{}.json".format(task)).write_text(json.dumps({
+            "description": task, "columns": {"rt": {"Description": "Reaction time", "Units": "s"}}}))
+    loaded = []
+    load_task_file = task_metadata.load_task_file
+
+    def spy(task_file, **kwargs):
+        loaded.append(Path(task_file).stem)
+        return load_task_file(task_file, **kwargs)
+    monkeypatch.setattr(task_metadata, "load_task_file", spy)
+    merged = merge_events_schema(TaskRegistry(tmp_path).columns,
+                                 {"prp": {"rt": {"Units": "ms", "Minimum": 0}, "resp": {"Levels": {"left": ""}}}})
+    assert merged["prp"] == {"rt": {"Description": "Reaction time", "Units": "s", "Minimum": 0},
+                             "resp": {"Levels": {"left": ""}}}
+    assert loaded == ["prp"]
+    # The other tasks are still there, merged when accessed:
+    assert sorted(merged) == ["auditory", "prp", "visual"]
+    assert merged["visual"] == {"rt": {"Description": "Reaction time", "Units": "s"}}
+    assert loaded == ["prp", "visual"]
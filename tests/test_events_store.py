@@ -0,0 +1,27 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+from bids_converter.bids import BIDSFile
+from bids_converter.beh.events_store import consolidate_events, read_events_store
+
+COLUMNS = {"prp": {"RT": {"Units": "s"}, "category": {"Levels": {"face": "", "object": ""}}}}
+
+
+def _events_file(root, subject, content):
+    beh_dir = root / "sub-{}".format(subject) / "beh"
+    beh_dir.mkdir(parents=True)
+    fname = "sub-{}_task-prp_events.tsv".format(subject)
+    (beh_dir / fname).write_text(content)
+    return BIDSFile.from_fname(str(beh_dir), fname, datatype="beh")
+
+
+def test_values_that_are_not_numbers_are_kept(tmp_path, capsys):
+    files = [_events_file(tmp_path, "01", "RT\tcategory\n0.5\tface\nn/a\tobject\n"),
+             _events_file(tmp_path, "02", "RT\tcategory\nface\tface\n0.25\tobject\n")]
+    store_root = consolidate_events(tmp_path, files, COLUMNS, verbose=False)
+    assert "WARNING: The column RT of" in capsys.readouterr().out
+    schemas = {subject: pq.read_schema(store_root / "bids_task=prp" / "bids_subject={}".format(subject) /
+                                       "events.parquet") for subject in ["01", "02"]}
+    assert schemas["01"].field("RT").type == pa.float64()
+    assert schemas["02"].field("RT").type in [pa.string(), pa.large_string()]
+    events = read_events_store(tmp_path)
+    assert [value if value == value else None for value in events["RT"]] == ["0.5", None, "face", "0.25"]
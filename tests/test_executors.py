@@ -0,0 +1,66 @@
+import json
+import shutil
+import hashlib
+import pytest
+from bids_converter.beh.convert_beh import beh_bids_metadata
+
+TASKS = {
+    "prp": {"description": "Psychological refractory period",
+            "columns": {"RT": {"Description": "Reaction time", "Units": "s"},
+                        "category": {"Description": "Category of the stimulus",
+                                     "Levels": {"face": "Faces", "object": "Objects"}}}},
+    "auditory": {"description": "Auditory oddball",
+                 "columns": {"tone": {"Description": "Tone", "Levels": {"1": "Standard", "2": "Deviant"}}}},
+}
+
+
+def _make_tree(root):
+    """
+    This function creates a small bids root with two tasks, sessions and runs, with columns that are not described
+    and values that do not match their description, so that every step has something to report.
+    :param root: (path) directory to create
+    :return: metadata_dir: (path) directory of the task metadata files
+    """
+    metadata_dir = root / "tasks"
+    metadata_dir.mkdir(parents=True)
+    for task, metadata in TASKS.items():
+        (metadata_dir / "{}.json".format(task)).write_text(json.dumps(metadata))
+    bids_root = root / "bids"
+    for i, subject in enumerate(["01", "02", "03"]):
+        for session in ["1", "2"]:
+            beh_dir = bids_root / "sub-{}".format(subject) / "ses-{}".format(session) / "beh"
+            beh_dir.mkdir(parents=True)
+            for run in ["1", "2"]:
+                prefix = "sub-{}_ses-{}".format(subject, session)
+                (beh_dir / "{}_task-prp_run-{}_events.tsv".format(prefix, run)).write_text(
+                    "RT\tcategory\tjitter\n0.{}5\tface\t0.1\nn/a\tobject\t0.2\n{}\tletter\t0.3\n".format(
+                        i, "face" if subject == "02" else "0.75"))
+            (beh_dir / "{}_task-auditory_events.tsv".format(prefix)).write_text("tone\n1\n2\n3\n")
+    return metadata_dir, bids_root
+
+
+def _digests(root):
+    return {str(path.relative_to(root)): hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in sorted(root.rglob("*")) if path.is_file()}
+
+
+@pytest.mark.parametrize("options", [
+    {"infer_schema": True, "validate": True, "validate_values": True, "consolidate": True},
+    {"inheritance": "session", "infer_schema": True, "validate": True},
+    {"streaming": True, "inheritance": "root", "validate": True},
+    {"streaming": True, "incremental": True},
+], ids=["full", "inheritance", "streaming_inheritance", "streaming"])
+def test_executors_give_identical_files(tmp_path, options):
+    metadata_dir, bids_root = _make_tree(tmp_path / "source")
+    digests = {}
+    # The runs share the same path, as the events store records the path of the files it was built from:
+    for executor in ["serial", "threads", "processes"]:
+        shutil.copytree(bids_root, tmp_path / "bids")
+        beh_bids_metadata(tmp_path / "bids", metadata_dir, verbose=False, n_jobs=2, executor=executor, **options)
+        digests[executor] = _digests(tmp_path / "bids")
+        shutil.rmtree(tmp_path / "bids")
+    assert any(name.endswith("_events.json") for name in digests["serial"])
+    if options.get("consolidate"):
+        assert any(name.endswith(".parquet") for name in digests["serial"])
+    assert digests["threads"] == digests["serial"]
+    assert digests["processes"] == digests["serial"]
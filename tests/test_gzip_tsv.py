@@ -0,0 +1,58 @@
+import gzip
+import shutil
+import struct
+import subprocess
+import pytest
+from bids_converter import gzip_tsv
+from bids_converter.beh.ingest_beh import ingest_beh_logs
+from bids_converter.gzip_tsv import _find_members, compress_member, read_gzip, write_gzip
+
+CONTENT = b"".join(b"%d\t%.3f\tn/a\n" % (i, i / 7) for i in range(50000))
+
+
+@pytest.mark.parametrize("content", [CONTENT, b"onset\tduration\n", b""], ids=["rows", "header", "empty"])
+@pytest.mark.parametrize("n_threads", [1, 3])
+def test_round_trip(tmp_path, monkeypatch, content, n_threads):
+    monkeypatch.setattr(gzip_tsv, "GZIP_BLOCK_BYTES", 4096)
+    gz_file = tmp_path / "events.tsv.gz"
+    size = write_gzip(gz_file, content, n_threads=n_threads)
+    data = gz_file.read_bytes()
+    assert size == len(data) > 0
+    # One member per block, located without decompressing them, and readable by any gzip reader:
+    assert len(_find_members(data)) == max(-(-len(content) // 4096), 1)
+    assert read_gzip(gz_file, n_threads=n_threads) == content
+    assert gzip.decompress(data) == content
+    if shutil.which("gzip"):
+        subprocess.run(["gzip", "-t", str(gz_file)], check=True)
+    # Content produced on the fly, in blocks of any size:
+    write_gzip(tmp_path / "again.tsv.gz", iter([content[:1000], content[1000:]]), n_threads=n_threads)
+    assert read_gzip(tmp_path / "again.tsv.gz") == content
+
+
+def test_standard_gzip_files(tmp_path):
+    gz_file = tmp_path / "events.tsv.gz"
+    gz_file.write_bytes(gzip.compress(CONTENT))
+    assert _find_members(gz_file.read_bytes()) is None
+    assert read_gzip(gz_file, n_threads=2) == CONTENT
+
+
+def test_invalid_member_size():
+    member = bytearray(compress_member(b"trial\trt\n"))
+    # A member claiming a size of 0 would be found again and again:
+    struct.pack_into("<I", member, 14, 0)
+    assert _find_members(bytes(member)) is None
+    struct.pack_into("<I", member, 14, len(member) + 1)
+    assert _find_members(bytes(member)) is None
+
+
+def test_ingest_compressed_logs(tmp_path):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    (raw_root / "SX101").mkdir(parents=True)
+    (raw_root / "SX101" / "SX101_prp_run1.tsv").write_bytes(b"trial\trt\n" + CONTENT)
+    (raw_root / "SX101" / "SX101_prp_run2.tsv").write_bytes(b"trial\trt\n")
+    ingested = ingest_beh_logs(raw_root, bids_root, "{subject}/{subject}_{task}_run{run}.tsv", compress=True,
+                               verbose=False)
+    assert [f.name for f in ingested] == ["sub-SX101_task-prp_run-1_events.tsv.gz",
+                                          "sub-SX101_task-prp_run-2_events.tsv.gz"]
+    assert gzip.decompress(ingested[0].read_bytes()) == b"trial\trt\n" + CONTENT
+    assert gzip.decompress(ingested[1].read_bytes()) == b"trial\trt\n"
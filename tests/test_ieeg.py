@@ -0,0 +1,51 @@
+import json
+import numpy as np
+import pytest
+
+mne = pytest.importorskip("mne")
+pytest.importorskip("mne_bids")
+pytest.importorskip("pybv")
+from bids_converter.bids import BIDSCONV_DIR
+from bids_converter.ieeg import convert_ieeg
+from bids_converter.ieeg.convert_ieeg import IEEG_JOURNAL_FILE, ieeg_bids_conversion
+
+PATTERN = "{subject}/{subject}_{task}_run{run}.vhdr"
+
+
+def _export_recording(raw_root, subject, seed):
+    info = mne.create_info(["LA1", "LA2", "LA3", "LA4"], sfreq=250.0, ch_types="eeg")
+    raw = mne.io.RawArray(np.random.default_rng(seed).normal(0, 1e-5, (4, 500)), info, verbose=False)
+    (raw_root / subject).mkdir(parents=True, exist_ok=True)
+    mne.export.export_raw(raw_root / subject / "{}_dur_run1.vhdr".format(subject), raw, fmt="brainvision",
+                          overwrite=True, verbose=False)
+
+
+def test_resume_after_a_failed_subject(tmp_path, monkeypatch):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    _export_recording(raw_root, "SE101", 0)
+    (raw_root / "SE102").mkdir(parents=True)
+    (raw_root / "SE102" / "SE102_dur_run1.vhdr").write_text("not a BrainVision header")
+    with pytest.raises(Exception):
+        ieeg_bids_conversion(raw_root, bids_root, PATTERN, line_freq=60, verbose=False)
+    # The subject converted before the failure is in the bids root and in the journal, not the failed one:
+    assert (bids_root / "sub-SE101" / "ieeg" / "sub-SE101_task-dur_run-1_ieeg.vhdr").is_file()
+    assert not (bids_root / "sub-SE102").exists()
+
+    _export_recording(raw_root, "SE102", 1)
+    converted = []
+    convert_subject = convert_ieeg.convert_ieeg_subject
+
+    def convert_and_record(recordings, *args):
+        converted.append(recordings[0][1]["subject"])
+        return convert_subject(recordings, *args)
+    monkeypatch.setattr(convert_ieeg, "convert_ieeg_subject", convert_and_record)
+    journal = ieeg_bids_conversion(raw_root, bids_root, PATTERN, line_freq=60, verbose=False)
+    assert converted == ["SE102"]
+    assert (bids_root / "sub-SE102" / "ieeg" / "sub-SE102_task-dur_run-1_ieeg.vhdr").is_file()
+    with open(bids_root / BIDSCONV_DIR / IEEG_JOURNAL_FILE) as fl:
+        assert json.load(fl) == journal and len(journal) == 2
+    # Both subjects are listed in the merged participants.tsv, and the channels were typed as ecog:
+    participants = (bids_root / "participants.tsv").read_text()
+    assert "sub-SE101" in participants and "sub-SE102" in participants
+    channels = (bids_root / "sub-SE102" / "ieeg" / "sub-SE102_task-dur_run-1_channels.tsv").read_text()
+    assert "ECOG" in channels
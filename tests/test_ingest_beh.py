@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+import pytest
+from bids_converter.bids import bids_file_path, compile_filename_pattern, match_raw_files
+from bids_converter.beh.ingest_beh import ingest_beh_logs
+
+
+def test_compile_filename_pattern():
+    regex = compile_filename_pattern("{subject}/{task}/{subject}_{task}_run{run}_*.tsv")
+    match = regex.match("SX101/prp/SX101_prp_run1_2023.tsv")
+    assert match.groupdict() == {"subject": "SX101", "task": "prp", "run": "1"}
+    # Repeated entities must have the same value:
+    assert regex.match("SX101/prp/SX102_prp_run1_2023.tsv") is None
+    # Wildcards do not cross folders, and the whole path must match:
+    assert regex.match("SX101/prp/SX101_prp_run1_a/b.tsv") is None
+    assert regex.match("SX101/prp/SX101_prp_run1_2023.tsv.bak") is None
+    # Literal parts are not regular expressions:
+    assert compile_filename_pattern("{subject}.{task}.tsv").match("SX101xprpxtsv") is None
+
+
+@pytest.mark.parametrize("pattern", ["{subject}_run{run}.tsv", "{subject}_{task}_{date}.tsv"])
+def test_compile_filename_pattern_rejects_invalid_patterns(pattern):
+    with pytest.raises(AssertionError):
+        compile_filename_pattern(pattern)
+
+
+def test_bids_file_path():
+    assert bids_file_path({"subject": "SX101", "task": "prp", "run": "1"}) == Path(
+        "sub-SX101", "beh", "sub-SX101_task-prp_run-1_events.tsv")
+    assert bids_file_path({"subject": "SX101", "session": "1", "task": "prp", "recording": "eye1"},
+                          suffix="physio", extension=".tsv.gz") == Path(
+        "sub-SX101", "ses-1", "beh", "sub-SX101_ses-1_task-prp_recording-eye1_physio.tsv.gz")
+
+
+def test_ingest_beh_logs(tmp_path):
+    raw_root, bids_root = tmp_path / "raw", tmp_path / "bids"
+    for subject in ["SX101", "SX102"]:
+        (raw_root / subject).mkdir(parents=True)
+        (raw_root / subject / "{}_prp_run1.tsv".format(subject)).write_text("trial\trt\n1\t0.5\n")
+    (raw_root / "SX101" / "notes.txt").write_text("not a log")
+    assert [entities["subject"] for _, entities in match_raw_files(raw_root, "{subject}/{subject}_{task}_run{run}.tsv")
+            ] == ["SX101", "SX102"]
+    ingested = ingest_beh_logs(raw_root, bids_root, "{subject}/{subject}_{task}_run{run}.tsv", link="copy",
+                               verbose=False)
+    assert ingested == [bids_root / "sub-{0}".format(subject) / "beh" / "sub-{}_task-prp_run-1_events.tsv".format(
+        subject) for subject in ["SX101", "SX102"]]
+    assert ingested[0].read_text() == "trial\trt\n1\t0.5\n"
+    # The mtime of the raw file is kept, so that the next ingestion skips the file:
+    assert os.stat(ingested[0]).st_mtime_ns == os.stat(raw_root / "SX101" / "SX101_prp_run1.tsv").st_mtime_ns
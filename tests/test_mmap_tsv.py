@@ -0,0 +1,116 @@
+import gzip
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+from bids_converter import mmap_tsv
+from bids_converter.mmap_tsv import MappedTSV
+from bids_converter.beh.validate_events import check_events_values
+
+
+def _write(path, content):
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "wb") as fl:
+            fl.write(content)
+    else:
+        path.write_bytes(content)
+    return path
+
+
+def _expected(content, columns):
+    rows = [line.split(b"\t") for line in content.replace(b"\r\n", b"\n").split(b"\n")[1:] if line]
+    return {col: np.array([row[i] if i < len(row) else b"" for row in rows], dtype="S")
+            for i, col in enumerate(columns)}
+
+
+CONTENTS = [
+    b"a\tb\n1\t2\n3\t4\n",
+    b"\xef\xbb\xbfa\tb\r\n1\t2\r\n\r\n3\t4",
+    b"a\tb\n1\tn/a\n\t4\n",
+    b"a\tb\n",
+]
+
+
+@pytest.mark.parametrize("extension", [".tsv", ".tsv.gz"])
+@pytest.mark.parametrize("content", CONTENTS)
+def test_read_columns(tmp_path, content, extension):
+    tsv_file = _write(tmp_path / ("events" + extension), content)
+    with MappedTSV(tsv_file) as tsv:
+        assert tsv.columns == ["a", "b"]
+        expected = _expected(content, ["a", "b"])
+        for col in ["a", "b"]:
+            assert tsv[col].tolist() == expected[col].tolist()
+
+
+@pytest.mark.parametrize("extension", [".tsv", ".tsv.gz"])
+def test_ragged_rows_keep_their_columns(tmp_path, extension):
+    # A trailing tab gives rows one field more than the header:
+    tsv_file = _write(tmp_path / ("events" + extension), b"a\tb\n1\t2\t9\n3\t4\n")
+    with MappedTSV(tsv_file) as tsv:
+        assert tsv["a"].tolist() == [b"1", b"3"]
+        assert tsv["b"].tolist() == [b"2", b"4"]
+
+
+@pytest.mark.parametrize("extension", [".tsv", ".tsv.gz"])
+def test_fallback_after_several_segments(tmp_path, monkeypatch, extension):
+    monkeypatch.setattr(mmap_tsv, "SCAN_BLOCK_BYTES", 64)
+    rows = [b"%d\tx%d" % (i, i) for i in range(200)]
+    rows[150] = b'150\t"x150"'
+    rows[170] = b"170\tx170\textra"
+    content = b"a\tb\n" + b"\n".join(rows) + b"\n"
+    tsv_file = _write(tmp_path / ("events" + extension), content)
+    with MappedTSV(tsv_file, block_rows=7) as tsv:
+        columns = tsv.read_columns(["b", "a"])
+    assert columns["a"].tolist() == [b"%d" % i for i in range(200)]
+    assert columns["b"].tolist() == [b"x%d" % i for i in range(200)]
+
+
+def test_rows_longer_than_a_segment(tmp_path, monkeypatch):
+    monkeypatch.setattr(mmap_tsv, "SCAN_BLOCK_BYTES", 8)
+    content = b"a\tb\n" + b"x" * 50 + b"\t1\n2\t" + b"y" * 30 + b"\n"
+    for extension in [".tsv", ".tsv.gz"]:
+        with MappedTSV(_write(tmp_path / ("events" + extension), content)) as tsv:
+            assert tsv["a"].tolist() == [b"x" * 50, b"2"]
+            assert tsv["b"].tolist() == [b"1", b"y" * 30]
+
+
+def test_check_events_values_memory_does_not_grow_with_the_file(tmp_path, monkeypatch):
+    # Smaller segments than the files, so that both files are scanned in several segments:
+    monkeypatch.setattr(mmap_tsv, "SCAN_BLOCK_BYTES", 2 ** 20)
+
+    def peak_memory(n_rows):
+        events = pd.DataFrame({"cond": np.tile(["a", "b", "c", "n/a"], n_rows // 4),
+                               "rt": np.arange(n_rows) / 7, "other": "some text"})
+        tsv_file = tmp_path / "events_{}.tsv".format(n_rows)
+        events.to_csv(tsv_file, sep="\t", index=False)
+        del events
+        tracemalloc.start()
+        violations = check_events_values(tsv_file, {"cond": ("levels", {"a", "b"}), "rt": ("numeric", None)},
+                                         chunksize=4096)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert violations == {"cond": {"n_rows": n_rows // 4, "values": ["c"]}}
+        return peak
+
+    assert peak_memory(800000) < 2 * peak_memory(200000)
+
+
+@pytest.mark.parametrize("extension", [".tsv", ".tsv.gz"])
+def test_wide_field_memory(tmp_path, extension):
+    # A single wide field would make every field of its column as wide in the blocks:
+    rows = [b"%d\ts%d" % (i, i % 10) for i in range(200000)]
+    rows[1000] = b"1000\t" + b"w" * 400
+    tsv_file = _write(tmp_path / ("events" + extension), b"onset\tstim\n" + b"\n".join(rows) + b"\n")
+    tracemalloc.start()
+    n_rows = 0
+    with MappedTSV(tsv_file) as tsv:
+        for block in tsv.iter_blocks(["stim"]):
+            if n_rows <= 1000 < n_rows + len(block["stim"]):
+                assert block["stim"][1000 - n_rows] == b"w" * 400
+            n_rows += len(block["stim"])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert n_rows == 200000
+    # Before, the blocks of the wide column took 400 bytes per row, i.e. about 400 MB. Gzipped files are decompressed
+    # into a buffer of a segment:
+    assert peak < 24 * 2 ** 20 + (mmap_tsv.SCAN_BLOCK_BYTES if extension == ".tsv.gz" else 0)
@@ -0,0 +1,32 @@
+import pandas as pd
+from bids_converter.bids import BIDSFile, create_participants_tsv
+
+
+def _events_files(*subjects):
+    return [BIDSFile.from_fname("beh", "sub-{}_task-prp_events.tsv".format(subject), datatype="beh")
+            for subject in subjects]
+
+
+def test_update_legacy_participants_tsv(tmp_path):
+    # As written by the former versions, with the data frame index as first column:
+    (tmp_path / "participants.tsv").write_text("\tparticipant_id\tage\tsex\n0\tsub-01\t30\tn/a\n1\tsub-10\tn/a\tM\n")
+    demographics = pd.DataFrame({"participant_id": ["01", "03", "10"], "age": [99, 25, 40], "sex": ["F", "F", "F"]})
+    create_participants_tsv(tmp_path, _events_files("01", "03", "10"), verbose=False, demographics=demographics)
+    assert (tmp_path / "participants.tsv").read_text() == (
+        "participant_id\tage\tsex\n"
+        "sub-01\t30\tF\n"
+        "sub-03\t25\tF\n"
+        "sub-10\t40\tM\n"
+    )
+    mtime = (tmp_path / "participants.tsv").stat().st_mtime_ns
+    create_participants_tsv(tmp_path, _events_files("01", "03", "10"), verbose=False, demographics=demographics)
+    assert (tmp_path / "participants.tsv").stat().st_mtime_ns == mtime
+
+
+def test_demographics_is_the_last_argument(tmp_path):
+    create_participants_tsv(tmp_path, _events_files("02", "01"), False, False)
+    assert (tmp_path / "participants.tsv").read_text() == (
+        "participant_id\tage\tsex\n"
+        "sub-01\tn/a\tn/a\n"
+        "sub-02\tn/a\tn/a\n"
+    )
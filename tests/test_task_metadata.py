@@ -0,0 +1,42 @@
+import json
+from bids_converter import task_metadata
+from bids_converter.task_metadata import load_task_file
+
+
+def _validate(content, task_file):
+    _validate.calls += 1
+    return content
+
+
+_validate.calls = 0
+
+
+def test_cache_is_invalidated_by_a_new_version(tmp_path, monkeypatch):
+    task_file = tmp_path / "prp.json"
+    task_file.write_text(json.dumps({"description": "PRP", "columns": {}}))
+    assert load_task_file(task_file, validate=_validate) == {"description": "PRP", "columns": {}}
+    assert (tmp_path / "__pycache__" / "prp.json.marshal").is_file()
+    calls = _validate.calls
+    # A new process reuses the compiled file:
+    task_metadata._loaded_task_files.clear()
+    load_task_file(task_file, validate=_validate)
+    assert _validate.calls == calls
+    # But not once the compilation changed:
+    task_metadata._loaded_task_files.clear()
+    monkeypatch.setattr(task_metadata, "TASK_METADATA_CACHE_VERSION", task_metadata.TASK_METADATA_CACHE_VERSION + 1)
+    load_task_file(task_file, validate=_validate)
+    assert _validate.calls == calls + 1
+
+
+def test_cache_only_holds_data(tmp_path):
+    task_file = tmp_path / "prp.json"
+    task_file.write_text(json.dumps({"description": "PRP", "columns": {"rt": {"Description": "RT", "Units": "s"}}}))
+    # A pickle would run code once loaded, the cache must not be one:
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "prp.json.marshal").write_bytes(
+        b"cos\nsystem\n(S'touch " + str(tmp_path / "pwned").encode() + b"'\ntR.")
+    task_metadata._loaded_task_files.clear()
+    assert load_task_file(task_file)["description"] == "PRP"
+    assert not (tmp_path / "pwned").exists()
+    task_metadata._loaded_task_files.clear()
+    assert load_task_file(task_file)["columns"] == {"rt": {"Description": "RT", "Units": "s"}}
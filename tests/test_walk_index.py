@@ -0,0 +1,47 @@
+import os
+import shutil
+from bids_converter.bids import BIDSCONV_DIR, _load_walk_index, scan_bids_datatypes, walk_bids_root
+
+
+def _make_bids_root(bids_root, subjects):
+    for subject in subjects:
+        for datatype, fname in [("beh", "task-prp_events.tsv"), ("ieeg", "task-dur_ieeg.edf")]:
+            (bids_root / subject / datatype).mkdir(parents=True)
+            (bids_root / subject / datatype / "{}_{}".format(subject, fname)).write_text("")
+    # Creating the folder of the index would modify the bids root:
+    (bids_root / BIDSCONV_DIR).mkdir()
+    # Directories modified just before a scan are not indexed:
+    _age_dirs(bids_root, 10 ** 18)
+
+
+def _age_dirs(bids_root, mtime_ns):
+    for dirpath, _, _ in os.walk(bids_root):
+        os.utime(dirpath, ns=(mtime_ns, mtime_ns))
+
+
+def test_scans_of_different_datatypes_share_the_index(tmp_path):
+    _make_bids_root(tmp_path, ["sub-01", "sub-02"])
+    ieeg = scan_bids_datatypes(tmp_path, filters={"ieeg": {"suffixes": ["ieeg"]}}, use_index=True)["ieeg"]
+    beh = walk_bids_root(tmp_path, use_index=True)
+    # The files are in the order of the directory listings:
+    assert sorted(f.fname for f in ieeg) == ["sub-01_task-dur_ieeg.edf", "sub-02_task-dur_ieeg.edf"]
+    assert sorted(f.fname for f in beh) == ["sub-01_task-prp_events.tsv", "sub-02_task-prp_events.tsv"]
+    # The beh scan keeps the ieeg folders indexed by the ieeg scan:
+    assert sorted(_load_walk_index(tmp_path)) == [".", "sub-01", "sub-01/beh", "sub-01/ieeg", "sub-02", "sub-02/beh",
+                                                  "sub-02/ieeg"]
+    # A removed subject is dropped from the index with its folders, even by a scan of other datatypes:
+    shutil.rmtree(tmp_path / "sub-02")
+    _age_dirs(tmp_path, 10 ** 18 + 10 ** 9)
+    assert [f.fname for f in walk_bids_root(tmp_path, use_index=True)] == ["sub-01_task-prp_events.tsv"]
+    assert sorted(_load_walk_index(tmp_path)) == [".", "sub-01", "sub-01/beh", "sub-01/ieeg"]
+    assert [f.fname for f in scan_bids_datatypes(tmp_path, use_index=True)["ieeg"]] == ["sub-01_task-dur_ieeg.edf"]
+
+
+def test_recently_modified_folders_are_dropped_from_the_index(tmp_path):
+    _make_bids_root(tmp_path, ["sub-01"])
+    walk_bids_root(tmp_path, use_index=True)
+    assert "sub-01/beh" in _load_walk_index(tmp_path)
+    (tmp_path / "sub-01" / "beh" / "sub-01_task-prp_run-2_events.tsv").write_text("")
+    assert len(walk_bids_root(tmp_path, use_index=True)) == 2
+    # The listing of the folder is kept, but not reused until its mtime is older than the scan:
+    assert _load_walk_index(tmp_path)["sub-01/beh"][0] is None